@@ -0,0 +1,82 @@
+"""
+Benchmark the streaming conversions on a synthetic corpus.
+
+Generates a headline|link|label corpus of --size-gb gigabytes, then converts it through every
+format and reports throughput and the peak memory of the process:
+
+    python -m benchmarks.convert --size-gb 2 --directory /tmp/convert-benchmark
+"""
+import argparse
+import os
+import random
+import resource
+import shutil
+import time
+
+from convert import convert
+
+
+WORDS = (
+    "man local area woman nation report study finds new trump obama year old city police "
+    "announces shocking americans scientists congress debate world after before breaking"
+).split()
+
+
+def generate(path, size):
+    """
+    Write a synthetic txt corpus of about `size` bytes, with a malformed line every 10000 lines.
+    """
+    generator = random.Random(0)
+    written = 0
+    with open(path, "w", encoding="utf-8") as file:
+        while written < size:
+            lines = []
+            for number in range(10000):
+                headline = " ".join(generator.choices(WORDS, k=generator.randint(6, 14))).capitalize()
+                link = f"https://example.com/{headline.lower().replace(' ', '-')}-{generator.getrandbits(32)}"
+                lines.append(f"{headline}|{link}|{generator.randint(0, 1)}\n")
+            lines.append("a line without separators\n")
+            text = "".join(lines)
+            file.write(text)
+            written += len(text)
+
+
+def get_peak_rss():
+    # Kilobytes on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--size-gb", type=float, default=2.0)
+    parser.add_argument("--directory", default="convert-benchmark")
+    parser.add_argument("--chunk-size", type=int, default=50000)
+    parser.add_argument("--keep", action="store_true", help="keep the generated files")
+    args = parser.parse_args()
+
+    os.makedirs(args.directory, exist_ok=True)
+    source = os.path.join(args.directory, "corpus.txt")
+    if not os.path.exists(source):
+        print(f"Generating {args.size_gb:.1f} GB corpus...")
+        generate(source, int(args.size_gb * 1024 ** 3))
+
+    steps = [("corpus.txt", "corpus.csv"), ("corpus.csv", "corpus.jsonl"),
+             ("corpus.jsonl", "corpus.parquet"), ("corpus.parquet", "corpus.arrow"),
+             ("corpus.arrow", "roundtrip.txt")]
+    print(f"{'conversion':<34}{'rows':>12}{'malformed':>11}{'MB/s':>9}{'rows/s':>12}{'peak RSS MB':>13}")
+    for source_name, target_name in steps:
+        source_path = os.path.join(args.directory, source_name)
+        target_path = os.path.join(args.directory, target_name)
+        start = time.perf_counter()
+        report = convert(source_path, target_path, chunk_size=args.chunk_size)
+        elapsed = time.perf_counter() - start
+        megabytes = os.path.getsize(source_path) / 1024 ** 2
+        print(f"{source_name + ' -> ' + target_name:<34}{report.rows:>12}{report.malformed:>11}"
+              f"{megabytes / elapsed:>9.1f}{report.rows / elapsed:>12.0f}{get_peak_rss():>13.0f}")
+
+    if not args.keep:
+        shutil.rmtree(args.directory)
+
+
+if __name__ == "__main__":
+    main()
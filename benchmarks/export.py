@@ -0,0 +1,107 @@
+"""
+Benchmark the cold start and memory of an exported model against its pickled pipeline.
+
+Each way of loading runs in a fresh interpreter, which imports what it needs, loads the model
+and scores one headline. Trains a SGD model on synthetic headlines unless --model-dir is given,
+once with short tokens only and once with a single --long-token characters long added, whose
+length must not weigh on the size of the export:
+
+    python -m benchmarks.export --model-dir models/sgd
+"""
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+
+from export import export_model
+
+
+PIPELINE = """
+import joblib
+pipeline = joblib.load({path!r})
+pipeline.decision_function(["man bite dog"])
+"""
+SCORER = """
+from export import LinearScorer
+scorer = LinearScorer.load({path!r})
+scorer.decision_function(["man bite dog"])
+"""
+# ru_maxrss survives exec, it would be the peak of this process, VmHWM starts over
+MEASURE = """
+import time
+start = time.perf_counter()
+{code}
+elapsed = time.perf_counter() - start
+with open("/proc/self/status") as file:
+    rss = next(int(line.split()[1]) for line in file if line.startswith("VmHWM"))
+print(elapsed, rss / 1024)
+"""
+
+
+def measure(code):
+    """
+    Return the seconds and the peak RSS in MB of `code` run in a fresh interpreter.
+    """
+    output = subprocess.run([sys.executable, "-c", MEASURE.format(code=code)], capture_output=True, text=True,
+                            check=True, cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    elapsed, rss = output.stdout.split()
+    return float(elapsed), float(rss)
+
+
+def get_size(path):
+    if os.path.isfile(path):
+        return os.path.getsize(path)
+    return sum(os.path.getsize(os.path.join(path, name)) for name in os.listdir(path))
+
+
+def train_model(directory, rows, long_token=0):
+    import joblib
+    from sklearn.feature_extraction.text import CountVectorizer, TfidfTransformer
+    from sklearn.linear_model import SGDClassifier
+    from sklearn.pipeline import Pipeline
+
+    from benchmarks.features import generate
+    from train import read_split
+
+    path = os.path.join(directory, "train.csv")
+    generate(path, rows)
+    if long_token:
+        with open(path, "a", encoding="utf-8") as file:
+            file.write(f"{'x' * long_token} s1,https://example.com/long,1\n")
+    headlines, labels = read_split(path)
+    pipeline = Pipeline([("vect", CountVectorizer()), ("tfidf", TfidfTransformer()), ("clf", SGDClassifier())])
+    pipeline.fit(headlines, labels)
+    model_dir = os.path.join(directory, f"sgd-{long_token}")
+    os.makedirs(model_dir)
+    joblib.dump(pipeline, os.path.join(model_dir, "pipeline.joblib"))
+    return model_dir
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--model-dir", help="directory of a pipeline.joblib written by train.py")
+    parser.add_argument("--rows", type=int, default=200000, help="rows of the synthetic training set")
+    parser.add_argument("--long-token", type=int, default=300, help="length of the long token of the second case")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        if args.model_dir:
+            cases = [("", args.model_dir)]
+        else:
+            cases = [("short tokens", train_model(directory, args.rows)),
+                     (f"{args.long_token}-char token", train_model(directory, args.rows, args.long_token))]
+        print(f"{'':<38}{'cold start s':>14}{'peak RSS MB':>13}{'size MB':>9}")
+        for index, (case, model_dir) in enumerate(cases):
+            export_dir = export_model(model_dir, os.path.join(directory, f"export-{index}"))
+            for label, code, path in (
+                ("joblib pipeline", PIPELINE, os.path.join(model_dir, "pipeline.joblib")),
+                ("LinearScorer", SCORER, export_dir),
+            ):
+                elapsed, rss = measure(code.format(path=os.path.abspath(path)))
+                size = get_size(path) / 1024 ** 2
+                print(f"{label + (f' ({case})' if case else ''):<38}{elapsed:>14.3f}{rss:>13.0f}{size:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""
+Benchmark the hashing features with partial_fit against the notebook's pipelines.
+
+Each variant runs in a fresh process, which reports its peak RSS, fit time and test accuracy.
+Uses datasets/train.csv and test.csv, or a synthetic corpus of --rows headlines:
+
+    python -m benchmarks.features --rows 1000000 --batch-size 20000
+"""
+import argparse
+import multiprocessing
+import os
+import random
+import resource
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+from sklearn.feature_extraction.text import CountVectorizer, TfidfTransformer
+from sklearn.linear_model import SGDClassifier
+from sklearn.metrics import accuracy_score
+from sklearn.naive_bayes import MultinomialNB
+from sklearn.pipeline import Pipeline
+
+from features import HashingFeaturizer, iter_csv_batches, partial_fit_batches
+
+
+CLASSIFIERS = {"SGD": SGDClassifier, "NB": MultinomialNB}
+
+
+def generate(path, rows):
+    """
+    Write a CSV of synthetic preprocessed headlines, a few of their words depend on the label.
+    """
+    generator = random.Random(0)
+    words = [[f"w{label}x{i}" for i in range(1000)] for label in (0, 1)]
+    shared = [f"s{i}" for i in range(50000)]
+    with open(path, "w", encoding="utf-8") as file:
+        file.write("Headline,Link,Label\n")
+        for row in range(rows):
+            label = generator.randint(0, 1)
+            # One word in ten comes from the other label, accuracies stay below 1
+            sides = [label if generator.random() < 0.9 else 1 - label for _ in range(2)]
+            tokens = generator.choices(shared, k=6) + [generator.choice(words[side]) for side in sides]
+            file.write(f"{' '.join(tokens)},https://example.com/{row},{label}\n")
+
+
+def run_pipeline(name, train_path, test_path, batch_size):
+    start = time.perf_counter()
+    train = pd.read_csv(train_path).dropna()
+    pipeline = Pipeline([
+        ("vect", CountVectorizer()),
+        ("tfidf", TfidfTransformer()),
+        ("clf", CLASSIFIERS[name]()),
+    ])
+    pipeline.fit(train["Headline"], train["Label"])
+    elapsed = time.perf_counter() - start
+    test = pd.read_csv(test_path).dropna()
+    accuracy = accuracy_score(test["Label"], pipeline.predict(test["Headline"]))
+    return elapsed, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, accuracy
+
+
+def run_hashing(name, train_path, test_path, batch_size):
+    start = time.perf_counter()
+    featurizer = HashingFeaturizer()
+    classifier = CLASSIFIERS[name]()
+    partial_fit_batches(classifier, iter_csv_batches(train_path, batch_size), featurizer)
+    elapsed = time.perf_counter() - start
+    correct = total = 0
+    for headlines, labels in iter_csv_batches(test_path, batch_size):
+        correct += (classifier.predict(featurizer.transform(headlines)) == labels).sum()
+        total += len(labels)
+    return elapsed, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, correct / total
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--train", default="datasets/train.csv")
+    parser.add_argument("--test", default="datasets/test.csv")
+    parser.add_argument("--rows", type=int, default=500000, help="rows of the synthetic corpus")
+    parser.add_argument("--batch-size", type=int, default=20000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        train_path, test_path = args.train, args.test
+        if not (os.path.exists(train_path) and os.path.exists(test_path)):
+            print(f"Generating a synthetic corpus of {args.rows} headlines...")
+            train_path, test_path = os.path.join(directory, "train.csv"), os.path.join(directory, "test.csv")
+            generate(train_path, args.rows)
+            generate(test_path, max(1000, args.rows // 5))
+
+        print(f"{'variant':<32}{'fit s':>9}{'peak RSS MB':>13}{'accuracy':>10}")
+        context = multiprocessing.get_context("spawn")
+        for name in CLASSIFIERS:
+            for label, function in (("CountVectorizer+Tfidf", run_pipeline), ("hashing+partial_fit", run_hashing)):
+                # A fresh process per variant, peak RSS never goes down
+                with ProcessPoolExecutor(1, mp_context=context) as pool:
+                    elapsed, rss, accuracy = pool.submit(function, name, train_path, test_path, args.batch_size).result()
+                print(f"{name + ' ' + label:<32}{elapsed:>9.1f}{rss:>13.0f}{accuracy:>10.3f}")
+
+
+if __name__ == "__main__":
+    main()
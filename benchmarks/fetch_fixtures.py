@@ -0,0 +1,75 @@
+"""
+Download the listing pages benchmarks.parsers runs on, into benchmarks/fixtures/<site>/<unit>.html.
+
+Fetches the first --pages listing pages of every HTML site, at the site's own rate. Pages
+already saved are kept, so the fixture set only changes when asked to:
+
+    python -m benchmarks.fetch_fixtures --pages 3
+    python -m benchmarks.fetch_fixtures --sites theonion.com huffpost.com --force
+"""
+import argparse
+import asyncio
+import itertools
+import logging
+import os
+
+import aiohttp
+
+from crawler.session import SessionPool
+from crawler.sites import SITES, SiteScraper
+
+
+FIXTURES = os.path.join(os.path.dirname(__file__), "fixtures")
+
+
+async def fetch_site(session, spec, directory, pages, force=False):
+    """
+    Save the first `pages` listing pages of a site, return the number of pages written.
+    """
+    scraper = SiteScraper(spec, sitemaps=False)
+    os.makedirs(os.path.join(directory, spec.name), exist_ok=True)
+    written = 0
+    for unit, url in itertools.islice(scraper.get_page_urls(), pages):
+        path = os.path.join(directory, spec.name, f"{unit}.html")
+        if os.path.exists(path) and not force:
+            continue
+        try:
+            async with session.get(url) as response:
+                response.raise_for_status()
+                html = await response.text()
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            logging.error(f"Error fetching {url}: {e}")
+            continue
+        with open(path, "w", encoding="utf-8") as file:
+            file.write(html)
+        written += 1
+        await asyncio.sleep(1 / scraper.rate)
+    return written
+
+
+async def fetch_fixtures(sites, directory, pages, force=False):
+    pool = SessionPool(limit=len(sites), limit_per_host=1)
+    session = await pool.open()
+    try:
+        counts = await asyncio.gather(*(fetch_site(session, SITES[site], directory, pages, force) for site in sites))
+    finally:
+        await pool.close()
+    for site, count in zip(sites, counts):
+        logging.info(f"{site}: {count} pages written.")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    html_sites = sorted(name for name, spec in SITES.items() if spec.extract is None)
+    parser.add_argument("--sites", nargs="+", choices=html_sites, default=html_sites)
+    parser.add_argument("--pages", type=int, default=3, help="listing pages per site")
+    parser.add_argument("--fixtures", default=FIXTURES)
+    parser.add_argument("--force", action="store_true", help="download pages already saved again")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+    asyncio.run(fetch_fixtures(args.sites, args.fixtures, args.pages, args.force))
+
+
+if __name__ == "__main__":
+    main()
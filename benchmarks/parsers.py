@@ -0,0 +1,65 @@
+"""
+Benchmark the HTML parser backends on saved pages of every site.
+
+Runs on the pages saved under benchmarks/fixtures/<site name>/, for example
+benchmarks/fixtures/theonion.com/2021-06-07.html, which benchmarks.fetch_fixtures downloads:
+
+    python -m benchmarks.fetch_fixtures --pages 3
+    python -m benchmarks.parsers --repeat 5
+"""
+import argparse
+import glob
+import os
+import time
+
+from crawler.parsing import PARSERS, get_parser
+from crawler.sites import SITES
+
+
+def benchmark(parser, pages, selectors, repeat):
+    """
+    Return (pages per second, rows per pass) of a parser over a list of pages.
+    """
+    start = time.perf_counter()
+    for _ in range(repeat):
+        rows = sum(len(parser.extract(html, selectors)) for html in pages)
+    elapsed = time.perf_counter() - start
+    return len(pages) * repeat / elapsed, rows
+
+
+def main():
+    argument_parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    argument_parser.add_argument("--fixtures", default=os.path.join(os.path.dirname(__file__), "fixtures"))
+    argument_parser.add_argument("--repeat", type=int, default=3)
+    args = argument_parser.parse_args()
+
+    parsers = []
+    for name in PARSERS:
+        try:
+            parsers.append(get_parser(name))
+        except ImportError:
+            print(f"Skipping {name}, it is not installed.")
+
+    if not glob.glob(os.path.join(args.fixtures, "*", "*.html")):
+        print(f"No pages in {args.fixtures}, download them with python -m benchmarks.fetch_fixtures")
+        return
+    print(f"{'site':<24}{'pages':>6}" + "".join(f"{parser.name + ' p/s':>18}" for parser in parsers))
+    for site, spec in sorted(SITES.items()):
+        if spec.extract is not None:
+            continue  # Not an HTML source
+        paths = sorted(glob.glob(os.path.join(args.fixtures, site, "*.html")))
+        if not paths:
+            continue
+        pages = []
+        for path in paths:
+            with open(path, encoding="utf-8", errors="replace") as file:
+                pages.append(file.read())
+        line = f"{site:<24}{len(pages):>6}"
+        for parser in parsers:
+            pages_per_second, rows = benchmark(parser, pages, spec.selectors, args.repeat)
+            line += f"{pages_per_second:>11.1f} ({rows:>4})"
+        print(line)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""
+Benchmark the preprocessing module against the loops of experiment.ipynb.
+
+Uses the headlines of --data (datasets/train.csv by default) or synthetic ones, checks that
+both paths give the same output and reports headlines per second:
+
+    python -m benchmarks.preprocessing --rows 100000
+"""
+import argparse
+import os
+import random
+import re
+import time
+
+import pandas as pd
+from nltk.stem import PorterStemmer
+from nltk.tokenize import word_tokenize
+
+from preprocessing import Preprocessor, get_stop_words
+
+
+def notebook(headlines, stop_words):
+    """
+    The preprocessing cells of experiment.ipynb, with the stop words as a list.
+    """
+    def remove_special_character(text):
+        text = text.lower()
+        text = re.sub("[^0-9a-z ]", '', text)
+        return text
+
+    df = pd.DataFrame({"Headline": headlines})
+    df.loc[:, "Headline"] = df["Headline"].apply(remove_special_character)
+    # preserve_line skips the sentence splitter, cleaned headlines have no sentence punctuation
+    tokenized = [word_tokenize(header, preserve_line=True) for header in df["Headline"]]
+    filtered = []
+    for words_in_quote in tokenized:
+        filtered.append([word for word in words_in_quote if word not in stop_words])
+    stemmer = PorterStemmer()
+    stemmed = []
+    for sent_filtered in filtered:
+        stemmed.append([stemmer.stem(word) for word in sent_filtered])
+    return [" ".join(sent) for sent in stemmed]
+
+
+def get_headlines(path, rows):
+    if os.path.exists(path):
+        headlines = pd.read_csv(path)["Headline"].dropna().astype(str).tolist()
+        return (headlines * (rows // len(headlines) + 1))[:rows]
+    generator = random.Random(0)
+    words = ("Man Local Area Woman Nation's Report: Study Finds New Trump Obama Year-Old City Police "
+             "Announces Shocking Americans Scientists Congress Debate World After Before Breaking "
+             "cannot gonna Running Runs Ran Happily Happier Happiest Cats Dogs Flying Flies").split()
+    return [" ".join(generator.choices(words, k=generator.randint(6, 14))) + "!" for _ in range(rows)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--data", default="datasets/train.csv")
+    parser.add_argument("--rows", type=int, default=100000)
+    args = parser.parse_args()
+
+    try:
+        stop_words = sorted(get_stop_words())
+    except LookupError:
+        from sklearn.feature_extraction.text import ENGLISH_STOP_WORDS
+
+        print("NLTK stop words are not downloaded, using scikit-learn's.")
+        stop_words = sorted(ENGLISH_STOP_WORDS)
+    headlines = get_headlines(args.data, args.rows)
+
+    start = time.perf_counter()
+    expected = notebook(headlines, stop_words)
+    notebook_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    result = Preprocessor(stop_words).transform(headlines)
+    module_time = time.perf_counter() - start
+
+    mismatches = sum(a != b for a, b in zip(expected, result))
+    print(f"{len(headlines)} headlines, {mismatches} different outputs")
+    print(f"notebook loops   {notebook_time:8.2f}s {len(headlines) / notebook_time:10.0f} headlines/s")
+    print(f"preprocessing.py {module_time:8.2f}s {len(headlines) / module_time:10.0f} headlines/s "
+          f"({notebook_time / module_time:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
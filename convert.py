@@ -0,0 +1,274 @@
+"""
+Convert headline datasets between formats in fixed-size chunks.
+
+Formats:
+    txt      headline|link|label lines, as written by the crawler with --format txt
+    csv      Headline,Link,Label with a header row
+    jsonl    one {"Headline", "Link", "Label"} object per line
+    arrow    an Arrow IPC file, or a corpus directory written by the crawler (read only)
+    parquet  a Parquet file
+
+Only `chunk_size` rows are held in memory at a time, whatever the size of the input.
+
+    python convert.py datasets/raw/theonion.com.txt datasets/theonion.csv
+    python convert.py datasets/corpus datasets/corpus.parquet --chunk-size 100000
+"""
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+
+
+FORMATS = ("txt", "csv", "jsonl", "arrow", "parquet")
+EXTENSIONS = {
+    ".txt": "txt",
+    ".csv": "csv",
+    ".jsonl": "jsonl",
+    ".json": "jsonl",
+    ".arrow": "arrow",
+    ".feather": "arrow",
+    ".ipc": "arrow",
+    ".parquet": "parquet",
+}
+FIELDS = ("Headline", "Link", "Label")
+
+
+class ConversionReport:
+    """
+    Counts of a conversion, malformed lines are skipped and counted rather than aborting it.
+    """
+
+    MAX_EXAMPLES = 10
+
+    def __init__(self):
+        self.rows = 0
+        self.malformed = 0
+        self.examples = []
+        self.elapsed = 0.0
+
+    def add_malformed(self, line_number, line):
+        self.malformed += 1
+        if len(self.examples) < self.MAX_EXAMPLES:
+            self.examples.append((line_number, line[:200]))
+
+    def __str__(self):
+        text = f"{self.rows} rows converted, {self.malformed} malformed lines skipped in {self.elapsed:.1f}s"
+        for line_number, line in self.examples:
+            text += f"\n  line {line_number}: {line!r}"
+        return text
+
+
+def guess_format(path):
+    """
+    Return the format of a path from its extension, directories are Arrow corpora.
+    """
+    if os.path.isdir(path):
+        return "arrow"
+    extension = os.path.splitext(path)[1].lower()
+    if extension not in EXTENSIONS:
+        raise ValueError(f"Cannot tell the format of {path}, pass it explicitly")
+    return EXTENSIONS[extension]
+
+
+def parse_label(value):
+    label = int(value)
+    if label not in (0, 1):
+        raise ValueError(f"Invalid label {value!r}")
+    return label
+
+
+def read_txt(path, chunk_size, report):
+    chunk = []
+    with open(path, "r", encoding="utf-8", newline="") as file:
+        for line_number, line in enumerate(file, 1):
+            line = line.rstrip("\r\n")
+            if not line:
+                continue
+            # Headlines may contain "|", links and labels never do
+            parts = line.rsplit("|", 2)
+            try:
+                if len(parts) != 3 or not parts[0]:
+                    raise ValueError
+                chunk.append((parts[0], parts[1], parse_label(parts[2])))
+            except ValueError:
+                report.add_malformed(line_number, line)
+                continue
+            if len(chunk) >= chunk_size:
+                yield chunk
+                chunk = []
+    if chunk:
+        yield chunk
+
+
+def read_csv(path, chunk_size, report):
+    chunk = []
+    with open(path, "r", encoding="utf-8", newline="") as file:
+        reader = csv.reader(file)
+        next(reader, None)  # Header
+        for row in reader:
+            try:
+                if len(row) != 3 or not row[0]:
+                    raise ValueError
+                chunk.append((row[0], row[1], parse_label(row[2])))
+            except ValueError:
+                report.add_malformed(reader.line_num, ",".join(row))
+                continue
+            if len(chunk) >= chunk_size:
+                yield chunk
+                chunk = []
+    if chunk:
+        yield chunk
+
+
+def read_jsonl(path, chunk_size, report):
+    chunk = []
+    with open(path, "r", encoding="utf-8") as file:
+        for line_number, line in enumerate(file, 1):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+                chunk.append((record["Headline"], record["Link"], parse_label(record["Label"])))
+            except (ValueError, KeyError, TypeError):
+                report.add_malformed(line_number, line.rstrip("\n"))
+                continue
+            if len(chunk) >= chunk_size:
+                yield chunk
+                chunk = []
+    if chunk:
+        yield chunk
+
+
+def iter_batch_rows(batches):
+    for batch in batches:
+        columns = batch.to_pydict()
+        yield list(zip(columns["headline"], columns["link"], columns["label"]))
+
+
+def read_arrow(path, chunk_size, report):
+    import pyarrow as pa
+
+    from crawler.corpus import get_parts
+
+    paths = get_parts(path) if os.path.isdir(path) else [path]
+    for part in paths:
+        # Plain reads rather than a memory map, mapped pages would count against the memory bound
+        reader = pa.ipc.open_file(pa.OSFile(part, "rb"))
+        for index in range(reader.num_record_batches):
+            batch = reader.get_batch(index).select(["headline", "link", "label"])
+            yield from iter_batch_rows(
+                batch.slice(offset, chunk_size) for offset in range(0, batch.num_rows, chunk_size)
+            )
+
+
+def read_parquet(path, chunk_size, report):
+    import pyarrow.parquet as pq
+
+    file = pq.ParquetFile(path, pre_buffer=False, buffer_size=1 << 20)
+    yield from iter_batch_rows(file.iter_batches(batch_size=chunk_size, columns=["headline", "link", "label"]))
+
+
+class TextWriter:
+    def __init__(self, path, format):
+        self.file = open(path, "w", encoding="utf-8", newline="")
+        self.format = format
+        if format == "csv":
+            self.writer = csv.writer(self.file)
+            self.writer.writerow(FIELDS)
+
+    def write(self, chunk):
+        if self.format == "csv":
+            self.writer.writerows(chunk)
+        elif self.format == "jsonl":
+            self.file.write("".join(
+                json.dumps(dict(zip(FIELDS, row)), ensure_ascii=False) + "\n" for row in chunk
+            ))
+        else:
+            self.file.write("".join(f"{headline}|{link}|{label}\n" for headline, link, label in chunk))
+
+    def close(self):
+        self.file.close()
+
+
+class ColumnarWriter:
+    """
+    Writes every chunk as one record batch (Arrow) or row group (Parquet).
+    """
+
+    def __init__(self, path, format):
+        import pyarrow as pa
+
+        self.pa = pa
+        self.schema = pa.schema([("headline", pa.string()), ("link", pa.string()), ("label", pa.int8())])
+        if format == "parquet":
+            import pyarrow.parquet as pq
+
+            self.writer = pq.ParquetWriter(path, self.schema, compression="zstd")
+        else:
+            self.writer = pa.ipc.new_file(path, self.schema)
+
+    def write(self, chunk):
+        headlines, links, labels = zip(*chunk)
+        self.writer.write_batch(self.pa.record_batch([headlines, links, labels], schema=self.schema))
+
+    def close(self):
+        self.writer.close()
+
+
+READERS = {
+    "txt": read_txt,
+    "csv": read_csv,
+    "jsonl": read_jsonl,
+    "arrow": read_arrow,
+    "parquet": read_parquet,
+}
+
+
+def convert(source, target, source_format=None, target_format=None, chunk_size=50000):
+    """
+    Convert `source` to `target` and return a ConversionReport.
+    """
+    source_format = source_format or guess_format(source)
+    target_format = target_format or guess_format(target)
+    if source_format not in FORMATS or target_format not in FORMATS:
+        raise ValueError(f"Unknown format, expected one of {', '.join(FORMATS)}")
+
+    directory = os.path.dirname(target)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    report = ConversionReport()
+    start = time.perf_counter()
+    # Write next to the target and rename at the end, a failed conversion leaves no partial file
+    temp_path = target + ".tmp"
+    writer = (ColumnarWriter if target_format in ("arrow", "parquet") else TextWriter)(temp_path, target_format)
+    try:
+        for chunk in READERS[source_format](source, chunk_size, report):
+            writer.write(chunk)
+            report.rows += len(chunk)
+    except BaseException:
+        writer.close()
+        os.remove(temp_path)
+        raise
+    writer.close()
+    os.replace(temp_path, target)
+    report.elapsed = time.perf_counter() - start
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("source")
+    parser.add_argument("target")
+    parser.add_argument("--from", dest="source_format", choices=FORMATS, help="format of the source, from its extension by default")
+    parser.add_argument("--to", dest="target_format", choices=FORMATS, help="format of the target, from its extension by default")
+    parser.add_argument("--chunk-size", type=int, default=50000, help="rows held in memory at a time")
+    args = parser.parse_args()
+
+    report = convert(args.source, args.target, args.source_format, args.target_format, args.chunk_size)
+    print(report, file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
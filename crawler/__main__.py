@@ -0,0 +1,123 @@
+"""
+Crawl any subset of the registered sites in parallel.
+
+    python -m crawler                              # every site
+    python -m crawler theonion.com huffpost.com    # a subset
+    python -m crawler --list
+"""
+import argparse
+import logging
+import sys
+from datetime import date
+
+from .cache import ResponseCache
+from .checkpoint import CheckpointStore
+from .engine import CrawlEngine
+from .ratelimit import RateLimiter
+from .session import SessionPool
+from .sites import SITES, SiteScraper
+from .writer import RecordWriter
+
+
+def parse_bound(value, spec):
+    """
+    Read a --start / --end value as a date or a page number depending on the site.
+    """
+    if value is None:
+        return None
+    return int(value) if spec.pagination == "pages" else date.fromisoformat(value)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m crawler", description="Crawl headlines from the registered sites.")
+    parser.add_argument("sites", nargs="*", help="sites to crawl, all of them by default")
+    parser.add_argument("--list", action="store_true", help="list the registered sites and exit")
+    parser.add_argument("--start", help="first date (YYYY-MM-DD) or page, overrides the site default")
+    parser.add_argument("--end", help="last date (YYYY-MM-DD) or page, overrides the site default")
+    parser.add_argument("--concurrency", type=int, default=32, help="requests in flight over all sites")
+    parser.add_argument("--per-host", type=int, default=2, help="requests in flight per site")
+    parser.add_argument("--rate", type=float, help="requests per second per site, overrides the site default")
+    parser.add_argument("--burst", type=int, default=2, help="requests a site may receive back to back")
+    parser.add_argument("--timeout", type=float, default=30, help="seconds before a request is abandoned")
+    parser.add_argument("--parser", help="HTML parser backend (selectolax, lxml, bs4)")
+    parser.add_argument("--parse-workers", type=int, help="parser processes, every core by default, 0 parses in-process")
+    parser.add_argument("--format", choices=RecordWriter.FORMATS, default="arrow", help="columnar corpus or <site>.txt files")
+    parser.add_argument("--output-dir", help="output directory, datasets/corpus or datasets/raw by default")
+    parser.add_argument("--batch-size", type=int, default=1000, help="rows buffered before a flush")
+    parser.add_argument("--flush-interval", type=float, default=2.0, help="seconds between flushes")
+    parser.add_argument("--checkpoint", default="crawl_state.sqlite3", help="checkpoint database")
+    parser.add_argument("--restart", action="store_true", help="forget the checkpoints of the selected sites")
+    parser.add_argument("--refresh", action="store_true", help="only crawl what is newer than the last complete crawl")
+    parser.add_argument("--sitemaps", action="store_true", help="crawl the sitemaps of the sites having one")
+    parser.add_argument("--cache-dir", help="cache responses on disk in this directory")
+    parser.add_argument("--cache-size", type=float, default=2.0, help="cache size in GB")
+    parser.add_argument("--revalidate", action="store_true", help="revalidate cached pages with the server")
+    parser.add_argument("--progress-interval", type=float, default=10, help="seconds between progress reports")
+    args = parser.parse_args(argv)
+    if args.output_dir is None:
+        args.output_dir = "datasets/corpus" if args.format == "arrow" else "datasets/raw"
+
+    if args.list:
+        for name, spec in SITES.items():
+            source = f"{spec.start} -> {spec.end}" + (", sitemap" if spec.sitemap else "")
+            needs = f" (needs {', '.join(spec.env.values())})" if spec.env else ""
+            print(f"{name:<26} {spec.pagination:<8} label={spec.label} {source}{needs}")
+        return
+
+    unknown = [name for name in args.sites if name not in SITES]
+    if unknown:
+        parser.error(f"unknown site(s): {', '.join(unknown)}, see --list")
+    if args.refresh and (args.start or args.end or args.restart):
+        parser.error("--refresh cannot be combined with --start, --end or --restart")
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+    checkpoint = CheckpointStore(args.checkpoint)
+    scrapers = []
+    for name in args.sites or SITES:
+        spec = SITES[name]
+        missing = spec.get_missing_env()
+        if missing:
+            logging.warning(f"Skipping {name}, set {' and '.join(missing)} to crawl it.")
+            continue
+        if args.restart:
+            checkpoint.reset(name)
+        since = checkpoint.get_mark(name) if args.refresh else None
+        if args.refresh and since is None:
+            logging.info(f"{name} was never crawled to the end, crawling its whole range.")
+        scrapers.append(SiteScraper(
+            spec,
+            start=parse_bound(args.start, spec),
+            end=parse_bound(args.end, spec),
+            rate=args.rate,
+            parser=args.parser,
+            since=since,
+            sitemaps=args.sitemaps,
+        ))
+
+    engine = CrawlEngine(
+        concurrency=args.concurrency,
+        per_host=args.per_host,
+        rate_limiter=RateLimiter(burst=args.burst),
+        session=SessionPool(limit=args.concurrency, limit_per_host=args.per_host, timeout=args.timeout),
+        checkpoint=checkpoint,
+        cache=ResponseCache(args.cache_dir, int(args.cache_size * 1024 ** 3)) if args.cache_dir else None,
+        revalidate=args.revalidate,
+        progress_interval=args.progress_interval,
+        parse_workers=args.parse_workers,
+        writer=RecordWriter(args.output_dir, checkpoint, args.batch_size, args.flush_interval, args.format),
+    )
+    try:
+        engine.run(*scrapers)
+        if args.format == "arrow":
+            from .corpus import compact_corpus
+
+            compact_corpus(args.output_dir)
+    except KeyboardInterrupt:
+        logging.info("Interrupted, run the same command again to resume.")
+        sys.exit(130)
+    finally:
+        checkpoint.close()
+
+
+if __name__ == "__main__":
+    main()
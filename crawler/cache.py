@@ -0,0 +1,145 @@
+import gzip
+import hashlib
+import os
+import sqlite3
+import time
+
+
+class ResponseCache:
+    """
+    On-disk cache of fetched pages.
+
+    Bodies are stored gzip-compressed under the SHA-256 of their content, so identical pages
+    are kept once, and an SQLite index maps every URL to its body and validators (ETag,
+    Last-Modified). When the bodies take more than `max_bytes`, the least recently used
+    entries are evicted.
+    """
+
+    def __init__(self, directory="http_cache", max_bytes=2 * 1024 ** 3):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        os.makedirs(directory, exist_ok=True)
+        self.connection = sqlite3.connect(os.path.join(directory, "index.sqlite3"))
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute(
+            """
+            CREATE TABLE IF NOT EXISTS entries (
+                url TEXT PRIMARY KEY,
+                digest TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                etag TEXT,
+                last_modified TEXT,
+                accessed REAL NOT NULL
+            )
+            """
+        )
+        self.connection.execute("CREATE INDEX IF NOT EXISTS entries_accessed ON entries (accessed)")
+        self.connection.commit()
+        cursor = self.connection.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM (SELECT DISTINCT digest, size FROM entries)"
+        )
+        self.total_bytes = cursor.fetchone()[0]
+
+    def get_path(self, digest):
+        return os.path.join(self.directory, digest[:2], digest + ".gz")
+
+    def get(self, url):
+        """
+        Return the cache entry of a URL as a dict, or None when the URL was never cached.
+        """
+        cursor = self.connection.execute(
+            "SELECT digest, etag, last_modified FROM entries WHERE url = ?", (url,)
+        )
+        row = cursor.fetchone()
+        if row is None or not os.path.exists(self.get_path(row[0])):
+            return None
+        self.touch(url)
+        return {"url": url, "digest": row[0], "etag": row[1], "last_modified": row[2]}
+
+    def get_conditional_headers(self, entry):
+        """
+        Build the headers asking the server to answer 304 if the cached page is still current.
+        """
+        headers = {}
+        if entry["etag"]:
+            headers["If-None-Match"] = entry["etag"]
+        if entry["last_modified"]:
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def read(self, entry):
+        """
+        Return the cached body of an entry.
+        """
+        with gzip.open(self.get_path(entry["digest"]), "rb") as file:
+            return file.read().decode("utf-8")
+
+    def discard(self, entry):
+        """
+        Forget a body that cannot be read, with every URL pointing to it.
+        """
+        self.connection.execute("DELETE FROM entries WHERE digest = ?", (entry["digest"],))
+        self.connection.commit()
+        self.remove_body_if_unused(entry["digest"])
+
+    def touch(self, url):
+        self.connection.execute("UPDATE entries SET accessed = ? WHERE url = ?", (time.time(), url))
+        self.connection.commit()
+
+    def put(self, url, body, etag=None, last_modified=None):
+        """
+        Store the body of a URL with its validators.
+        """
+        data = body.encode("utf-8")
+        digest = hashlib.sha256(data).hexdigest()
+        path = self.get_path(digest)
+        if os.path.exists(path):
+            size = os.path.getsize(path)
+        else:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            # Write then rename, a crash never leaves a truncated body behind
+            temp_path = f"{path}.{os.getpid()}.tmp"
+            with gzip.open(temp_path, "wb", compresslevel=6) as file:
+                file.write(data)
+            os.replace(temp_path, path)
+            size = os.path.getsize(path)
+            self.total_bytes += size
+        previous = self.connection.execute("SELECT digest FROM entries WHERE url = ?", (url,)).fetchone()
+        self.connection.execute(
+            "INSERT OR REPLACE INTO entries (url, digest, size, etag, last_modified, accessed) VALUES (?, ?, ?, ?, ?, ?)",
+            (url, digest, size, etag, last_modified, time.time()),
+        )
+        self.connection.commit()
+        if previous and previous[0] != digest:
+            self.remove_body_if_unused(previous[0])
+        if self.total_bytes > self.max_bytes:
+            self.evict()
+
+    def remove_body_if_unused(self, digest):
+        cursor = self.connection.execute("SELECT 1 FROM entries WHERE digest = ? LIMIT 1", (digest,))
+        if cursor.fetchone() is None:
+            path = self.get_path(digest)
+            if os.path.exists(path):
+                self.total_bytes -= os.path.getsize(path)
+                os.remove(path)
+
+    def evict(self):
+        """
+        Drop the least recently used entries until the cache fits in 90% of max_bytes.
+        """
+        target = self.max_bytes * 0.9
+        while self.total_bytes > target:
+            rows = self.connection.execute(
+                "SELECT url, digest FROM entries ORDER BY accessed LIMIT 100"
+            ).fetchall()
+            if not rows:
+                break
+            for url, digest in rows:
+                self.connection.execute("DELETE FROM entries WHERE url = ?", (url,))
+                self.remove_body_if_unused(digest)
+                if self.total_bytes <= target:
+                    break
+            self.connection.commit()
+
+    def close(self):
+        self.connection.close()
@@ -0,0 +1,109 @@
+import json
+import sqlite3
+import time
+
+
+class CheckpointStore:
+    """
+    Durable record of the units (days, months, pages...) a crawl has finished and the rows they produced.
+    """
+
+    def __init__(self, path="crawl_state.sqlite3"):
+        self.path = path
+        self.connection = sqlite3.connect(path)
+        # WAL keeps every commit durable without rewriting the whole database
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute(
+            """
+            CREATE TABLE IF NOT EXISTS units (
+                site TEXT NOT NULL,
+                unit TEXT NOT NULL,
+                url TEXT NOT NULL,
+                rows TEXT NOT NULL,
+                finished_at REAL NOT NULL,
+                PRIMARY KEY (site, unit)
+            )
+            """
+        )
+        # High-water mark of every site: its newest unit and the links found on it
+        self.connection.execute(
+            """
+            CREATE TABLE IF NOT EXISTS marks (
+                site TEXT PRIMARY KEY,
+                unit TEXT NOT NULL,
+                links TEXT NOT NULL,
+                updated_at REAL NOT NULL
+            )
+            """
+        )
+        self.connection.commit()
+
+    def get_done_units(self, site):
+        """
+        Return the set of units already finished for a site.
+        """
+        cursor = self.connection.execute("SELECT unit FROM units WHERE site = ?", (site,))
+        return {unit for (unit,) in cursor}
+
+    def is_done(self, site, unit):
+        cursor = self.connection.execute(
+            "SELECT 1 FROM units WHERE site = ? AND unit = ?", (site, str(unit))
+        )
+        return cursor.fetchone() is not None
+
+    def mark_done(self, site, unit, url, rows):
+        """
+        Record a finished unit with its rows, the commit makes it survive a crash.
+        """
+        self.connection.execute(
+            "INSERT OR REPLACE INTO units (site, unit, url, rows, finished_at) VALUES (?, ?, ?, ?, ?)",
+            (site, str(unit), url, json.dumps(rows), time.time()),
+        )
+        self.connection.commit()
+
+    def mark_many_done(self, units):
+        """
+        Record several finished (site, unit, url, rows) units in a single transaction.
+        """
+        now = time.time()
+        self.connection.executemany(
+            "INSERT OR REPLACE INTO units (site, unit, url, rows, finished_at) VALUES (?, ?, ?, ?, ?)",
+            [(site, str(unit), url, json.dumps(rows), now) for site, unit, url, rows in units],
+        )
+        self.connection.commit()
+
+    def get_rows(self, site):
+        """
+        Yield every row recorded for a site, in the order the units were finished.
+        """
+        cursor = self.connection.execute(
+            "SELECT rows FROM units WHERE site = ? ORDER BY finished_at", (site,)
+        )
+        for (rows,) in cursor:
+            yield from json.loads(rows)
+
+    def get_mark(self, site):
+        """
+        Return the (unit, links) high-water mark of a site, None before its first complete crawl.
+        """
+        cursor = self.connection.execute("SELECT unit, links FROM marks WHERE site = ?", (site,))
+        row = cursor.fetchone()
+        return (row[0], json.loads(row[1])) if row is not None else None
+
+    def set_mark(self, site, unit, links):
+        self.connection.execute(
+            "INSERT OR REPLACE INTO marks (site, unit, links, updated_at) VALUES (?, ?, ?, ?)",
+            (site, str(unit), json.dumps(links), time.time()),
+        )
+        self.connection.commit()
+
+    def reset(self, site):
+        """
+        Forget the progress of a site so that the next crawl starts from scratch.
+        """
+        self.connection.execute("DELETE FROM units WHERE site = ?", (site,))
+        self.connection.execute("DELETE FROM marks WHERE site = ?", (site,))
+        self.connection.commit()
+
+    def close(self):
+        self.connection.close()
@@ -0,0 +1,142 @@
+"""
+Columnar corpus of crawled headlines.
+
+The corpus is a directory of Arrow IPC files partitioned by site and month:
+
+    datasets/corpus/site=theonion.com/month=2021-06/part-<id>.arrow
+
+Arrow IPC files can be memory-mapped, so loading the corpus does not copy or re-parse the
+data, and headlines may contain any character, "|" included.
+"""
+import glob
+import os
+import time
+from datetime import date
+
+import pyarrow as pa
+
+
+SCHEMA = pa.schema([
+    ("headline", pa.string()),
+    ("link", pa.string()),
+    ("label", pa.int8()),
+    ("site", pa.string()),
+    ("crawled_at", pa.timestamp("s", tz="UTC")),
+    # Day the page is about for dated archives ("2021-06-07", "2021-06"), crawl day otherwise
+    ("date", pa.date32()),
+])
+
+
+def get_unit_date(unit, crawled_at):
+    """
+    Return the date of a crawl unit, falling back to the crawl date for page numbers.
+    """
+    try:
+        return date.fromisoformat(unit) if len(unit) == 10 else date.fromisoformat(f"{unit}-01")
+    except (TypeError, ValueError):
+        return crawled_at.date()
+
+
+def records_to_table(site, records):
+    """
+    Build a table from (headline, link, label, unit, crawled_at) records of a site.
+    """
+    headlines, links, labels, dates, crawled = [], [], [], [], []
+    for headline, link, label, unit, crawled_at in records:
+        headlines.append(headline)
+        links.append(link)
+        labels.append(int(label))
+        crawled.append(crawled_at)
+        dates.append(get_unit_date(unit, crawled_at))
+    return pa.table(
+        [headlines, links, labels, [site] * len(headlines), crawled, dates],
+        schema=SCHEMA,
+    )
+
+
+def write_table(corpus_dir, table, fsync=True):
+    """
+    Append a table of a single site to the corpus, one new part file per month.
+    """
+    site = table["site"][0].as_py()
+    months = [value.strftime("%Y-%m") for value in table["date"].to_pylist()]
+    for month in sorted(set(months)):
+        mask = pa.array([value == month for value in months])
+        part = table.filter(mask)
+        directory = os.path.join(corpus_dir, f"site={site}", f"month={month}")
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, f"part-{time.time_ns()}-{os.getpid()}.arrow")
+        write_file(part, path, fsync)
+
+
+def write_file(table, path, fsync=True):
+    """
+    Write a table to an Arrow IPC file atomically.
+    """
+    temp_path = path + ".tmp"
+    with pa.OSFile(temp_path, "wb") as sink:
+        with pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+    if fsync:
+        with open(temp_path, "rb") as file:
+            os.fsync(file.fileno())
+    os.replace(temp_path, path)
+
+
+def get_parts(corpus_dir, sites=None):
+    """
+    Return the part files of the corpus, optionally restricted to some sites.
+    """
+    patterns = [f"site={site}" for site in sites] if sites else ["site=*"]
+    paths = []
+    for pattern in patterns:
+        paths.extend(glob.glob(os.path.join(corpus_dir, pattern, "month=*", "*.arrow")))
+    return sorted(paths)
+
+
+def load_corpus(corpus_dir="datasets/corpus", columns=None, sites=None):
+    """
+    Load the corpus as a pyarrow Table backed by memory-mapped files, no data is copied.
+    """
+    tables = []
+    for path in get_parts(corpus_dir, sites):
+        table = pa.ipc.open_file(pa.memory_map(path, "r")).read_all()
+        tables.append(table.select(columns) if columns else table)
+    if not tables:
+        schema = pa.schema([SCHEMA.field(name) for name in columns]) if columns else SCHEMA
+        return schema.empty_table()
+    return pa.concat_tables(tables)
+
+
+def load_corpus_frame(corpus_dir="datasets/corpus", columns=None, sites=None):
+    """
+    Load the corpus as a pandas DataFrame whose columns stay Arrow arrays (pd.ArrowDtype).
+    """
+    import pandas as pd
+
+    return load_corpus(corpus_dir, columns, sites).to_pandas(types_mapper=pd.ArrowDtype)
+
+
+def compact_corpus(corpus_dir="datasets/corpus"):
+    """
+    Merge the part files of every partition into one, crawls leave one part per flush.
+    """
+    partitions = {}
+    for path in get_parts(corpus_dir):
+        partitions.setdefault(os.path.dirname(path), []).append(path)
+    for directory, paths in partitions.items():
+        if len(paths) < 2:
+            continue
+        table = pa.concat_tables(pa.ipc.open_file(pa.memory_map(path, "r")).read_all() for path in paths)
+        write_file(table.combine_chunks(), os.path.join(directory, f"part-{time.time_ns()}-compacted.arrow"))
+        for path in paths:
+            os.remove(path)
+
+
+def export_parquet(path, corpus_dir="datasets/corpus"):
+    """
+    Write the whole corpus to a single compressed Parquet file, e.g. to share it.
+    """
+    import pyarrow.parquet as pq
+
+    pq.write_table(load_corpus(corpus_dir), path, compression="zstd")
@@ -0,0 +1,112 @@
+"""
+Headline discovery from XML sitemaps, sitemap indexes and RSS / Atom feeds.
+
+A sitemap lists hundreds to thousands of articles per request where an HTML listing shows
+10 to 20. Documents are parsed incrementally, every element is dropped once read, so a 50 MB
+sitemap never becomes a tree in memory.
+"""
+import re
+import xml.etree.ElementTree as ET
+from urllib.parse import unquote, urlsplit
+
+
+CHUNK_SIZE = 64 * 1024
+SLUG_SUFFIX = re.compile(r"(-\d{5,})?(\.[a-z0-9]{2,5})?$")
+SLUG_SEPARATORS = re.compile(r"[-_+]+")
+
+
+def get_tag(element):
+    """
+    Return the tag of an element without its namespace.
+    """
+    return element.tag.rsplit("}", 1)[-1]
+
+
+def get_child_text(element, name):
+    for child in element:
+        if get_tag(child) == name:
+            return (child.text or "").strip()
+    return ""
+
+
+def get_slug_headline(link):
+    """
+    Turn the last path segment of an article URL into a headline, "/2021/06/man-bites-dog/"
+    gives "Man bites dog". Case and punctuation are lost, the preprocessing drops them anyway.
+    """
+    segments = [segment for segment in urlsplit(link).path.split("/") if segment]
+    if not segments:
+        return ""
+    slug = SLUG_SUFFIX.sub("", unquote(segments[-1]))
+    words = SLUG_SEPARATORS.sub(" ", slug).strip()
+    if not re.search(r"[A-Za-z]", words) or " " not in words:
+        return ""  # Ids and one-word slugs are no headlines
+    return words[0].upper() + words[1:]
+
+
+def iter_elements(document):
+    """
+    Yield the top-level entries of a document (url, sitemap, item, entry) as they are parsed.
+    """
+    parser = ET.XMLPullParser(events=("start", "end"))
+    parents = []
+    # Servers often send a blank line before the XML declaration, which must come first
+    document = document.lstrip()
+    for start in range(0, len(document), CHUNK_SIZE):
+        parser.feed(document[start:start + CHUNK_SIZE])
+        for event, element in parser.read_events():
+            if event == "start":
+                parents.append(element)
+                continue
+            parents.pop()
+            if get_tag(element) in ("url", "sitemap", "item", "entry"):
+                yield element
+                # Detach the entry from its parent, so that nothing read is kept
+                if parents:
+                    parents[-1].remove(element)
+    parser.close()
+
+
+def read_entry(element):
+    """
+    Return ("sitemap", url, lastmod) for an index entry, ("article", headline, link) otherwise.
+    """
+    tag = get_tag(element)
+    if tag == "sitemap":
+        return "sitemap", get_child_text(element, "loc"), get_child_text(element, "lastmod")
+    if tag == "url":
+        link = get_child_text(element, "loc")
+        # Google News sitemaps carry the headline in <news:news><news:title>
+        headline = ""
+        for child in element:
+            if get_tag(child) == "news":
+                headline = get_child_text(child, "title")
+        return "article", headline or get_slug_headline(link), link
+    if tag == "item":
+        return "article", get_child_text(element, "title"), get_child_text(element, "link")
+    # Atom entry
+    link = ""
+    for child in element:
+        if get_tag(child) == "link" and child.get("rel", "alternate") == "alternate":
+            link = child.get("href", "")
+            break
+    return "article", get_child_text(element, "title"), link
+
+
+def parse_document(document, sitemap_filter=None):
+    """
+    Parse a sitemap, sitemap index or feed.
+
+    Returns the (headline, link) pairs of its articles and the (url, lastmod) pairs of the child
+    sitemaps of an index, restricted to the URLs matching the `sitemap_filter` regex.
+    """
+    articles, sitemaps = [], []
+    pattern = re.compile(sitemap_filter) if sitemap_filter else None
+    for element in iter_elements(document):
+        kind, first, second = read_entry(element)
+        if kind == "sitemap":
+            if first and (pattern is None or pattern.search(first)):
+                sitemaps.append((first, second))
+        elif first and second:
+            articles.append((first, second))
+    return articles, sitemaps
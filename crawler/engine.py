@@ -0,0 +1,344 @@
+import asyncio
+import collections
+import logging
+import os
+import sqlite3
+import time
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import AsyncExitStack
+from urllib.parse import urlsplit
+
+import aiohttp
+
+from .checkpoint import CheckpointStore
+from .ratelimit import RateLimiter
+from .session import SessionPool
+from .writer import RecordWriter
+
+
+class CrawlEngine:
+    """
+    Fetch the pages of one or more scrapers concurrently.
+
+    A scraper (see sites.SiteScraper) plugs into the engine by providing:
+      - name: unique name of the source, used for checkpoints
+      - get_page_urls(): yields (unit, url) pairs, unit being a label such as "2021-06-07" or a page number
+      - parse_job(html): picklable callable returning the [headline, link, label] rows of a page
+      - rate: requests per second the site tolerates
+      - session: optional SessionPool used instead of the engine's one
+      - request_params: query parameters sent with every request but kept out of the URLs, such as API keys
+      - get_unit_key(unit): sort key of a unit, newer units sort last
+      - known_links: None, or the links of the last crawl for a refresh, see below
+      - discovers: if true, parse_job returns (rows, units) where units are new (unit, url)
+        pairs to crawl, such as the child sitemaps of a sitemap index
+
+    Rows go to a single RecordWriter, which records the finished units in a CheckpointStore once
+    they are on disk, a crawl that is started again skips them.
+    With a ResponseCache, cached pages are served from disk without touching the network, or
+    revalidated with a conditional request when `revalidate` is set.
+
+    After a site is crawled to the end, its newest unit and the links found on it are stored as
+    the site's high-water mark. A refresh scraper yields its units newest first down to the mark
+    and sets known_links: its units are fetched even if done before, and the site stops as soon
+    as a page holds a known link.
+    """
+
+    # Statuses a polite crawler should answer by slowing down and retrying
+    RETRY_STATUSES = {429, 503}
+
+    def __init__(
+        self,
+        concurrency=32,
+        per_host=2,
+        rate_limiter=None,
+        max_retries=3,
+        session=None,
+        checkpoint=None,
+        cache=None,
+        revalidate=False,
+        progress_interval=10,
+        parse_workers=None,
+        writer=None,
+    ):
+        self.concurrency = concurrency
+        self.per_host = per_host
+        self.rate_limiter = rate_limiter or RateLimiter()
+        self.session = session or SessionPool(limit=concurrency, limit_per_host=per_host)
+        self.checkpoint = checkpoint or CheckpointStore()
+        self.writer = writer or RecordWriter()
+        if self.writer.checkpoint is None:
+            self.writer.checkpoint = self.checkpoint
+        self.cache = cache
+        self.revalidate = revalidate
+        self.progress_interval = progress_interval
+        # 0 parses in the event loop, which is enough for a single slow site
+        self.parse_workers = (os.cpu_count() or 1) if parse_workers is None else parse_workers
+        self.max_retries = max_retries
+        self.host_slots = {}
+
+    def get_host_slot(self, url):
+        """
+        Return the semaphore bounding the in-flight requests to the host of a URL.
+        """
+        host = urlsplit(url).netloc
+        if host not in self.host_slots:
+            self.host_slots[host] = asyncio.Semaphore(self.per_host)
+        return self.host_slots[host]
+
+    def read_cached(self, cached):
+        """
+        Return the body of a cache entry, or None after discarding an entry that cannot be read.
+        """
+        try:
+            return self.cache.read(cached)
+        except (OSError, EOFError, zlib.error, UnicodeDecodeError) as e:
+            logging.error(f"Discarding the unreadable cache entry of {cached['url']}: {e}")
+            self.cache.discard(cached)
+            return None
+
+    async def fetch(self, session, url, rate=None, stopped=None, params=None):
+        """
+        Fetch a page within its host's rate and concurrency limits, return None on failure.
+
+        `stopped` is checked after every wait for the rate limiter: when it returns true, the
+        request is not sent and None is returned. `params` are added to the query of the request,
+        but not to the URL cached and logged.
+        """
+        cached = self.cache.get(url) if self.cache is not None else None
+        if cached is not None and not self.revalidate:
+            html = self.read_cached(cached)
+            if html is not None:
+                return html
+            cached = None
+        headers = self.cache.get_conditional_headers(cached) if cached is not None else None
+        for attempt in range(self.max_retries + 1):
+            # Waiting for a token only blocks this host, workers on other hosts keep going
+            await self.rate_limiter.acquire(url, rate)
+            # The site may have stopped while this request waited for its turn
+            if stopped is not None and stopped():
+                return None
+            async with self.get_host_slot(url), self.budget:
+                try:
+                    async with session.get(url, headers=headers, params=params) as response:
+                        if response.status in self.RETRY_STATUSES and attempt < self.max_retries:
+                            self.rate_limiter.back_off(url, response.headers.get("Retry-After"))
+                            continue
+                        if response.status == 304 and cached is not None:
+                            html = self.read_cached(cached)
+                            if html is not None:
+                                return html
+                            # Ask again for the whole page, without validators
+                            cached = headers = None
+                            continue
+                        response.raise_for_status()
+                        # A page with bytes invalid in its charset is still parsed, like requests did
+                        html = await response.text(errors="replace")
+                    if self.cache is not None:
+                        try:
+                            self.cache.put(
+                                url, html, response.headers.get("ETag"), response.headers.get("Last-Modified")
+                            )
+                        except (OSError, sqlite3.Error) as e:
+                            logging.error(f"Error caching {url}: {e}")
+                    return html
+                except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                    # The text of a response error holds the URL of the request, params included
+                    reason = f"{e.status}, {e.message}" if isinstance(e, aiohttp.ClientResponseError) else e
+                    logging.error(f"Error fetching {url}: {reason}")
+                    return None
+        return None
+
+    async def fetch_worker(self, session, queue):
+        """
+        Fetch queued units until cancelled and hand the pages over to the parsers.
+        """
+        while True:
+            scraper, unit, url = await queue.get()
+            stats = self.stats[scraper.name]
+            parsing = False
+            try:
+                if stats["stopped"]:
+                    # Units queued before the refresh stopped are dropped, not fetched
+                    stats["queued"] -= 1
+                    continue
+                pool = scraper.session.session if scraper.session is not None else session
+                html = await self.fetch(pool, url, scraper.rate, lambda: stats["stopped"],
+                                        scraper.request_params)
+                if html:
+                    stats["parsing"] += 1
+                    # Blocks while the parsers are behind, which pauses fetching (backpressure)
+                    await self.parse_queue.put((scraper, unit, url, html, queue))
+                    parsing = True
+                elif stats["stopped"]:
+                    stats["queued"] -= 1
+                else:
+                    stats["errors"] += 1
+            except Exception as e:
+                # A dead worker would leave its units in the queue and the crawl waiting forever
+                stats["errors"] += 1
+                logging.error(f"Error fetching {scraper.name} {unit} ({url}): {e}")
+            finally:
+                # A unit handed to the parsers is done once parsed, see parse_worker
+                if not parsing:
+                    queue.task_done()
+
+    async def parse_worker(self):
+        """
+        Parse fetched pages in the process pool and pass their rows to the writer.
+        """
+        loop = asyncio.get_running_loop()
+        while True:
+            scraper, unit, url, html, site_queue = await self.parse_queue.get()
+            stats = self.stats[scraper.name]
+            try:
+                if self.pool is not None:
+                    headline_data = await loop.run_in_executor(self.pool, scraper.parse_job, html)
+                else:
+                    headline_data = scraper.parse_job(html)
+                if scraper.discovers:
+                    headline_data, units = headline_data
+                    # Never blocks, crawl_site feeds them to the fetchers
+                    self.discovered[scraper.name].extend(units)
+                logging.debug(f"Number of articles extracted for {scraper.name} {unit}: {len(headline_data)}.")
+                # The writer checkpoints the unit once its rows are on disk
+                await self.writer.write(scraper.name, unit, url, headline_data)
+                stats["pages"] += 1
+                stats["rows"] += len(headline_data)
+                links = [link for _, link, _ in headline_data]
+                newest = stats["newest"]
+                if newest is None or scraper.get_unit_key(unit) > scraper.get_unit_key(newest[0]):
+                    stats["newest"] = (unit, links)
+                if scraper.known_links and not stats["stopped"] and scraper.known_links.intersection(links):
+                    stats["stopped"] = True
+                    logging.info(f"{scraper.name} {unit} holds links of the last crawl, stopping the refresh.")
+            except Exception as e:
+                stats["errors"] += 1
+                logging.error(f"Error processing {scraper.name} {unit} ({url}): {e}")
+            finally:
+                stats["parsing"] -= 1
+                site_queue.task_done()
+                self.parse_queue.task_done()
+
+    async def crawl_site(self, session, scraper):
+        """
+        Feed every unit of a scraper to its own fetch workers and wait until all are parsed.
+        """
+        # A bounded queue keeps the URL generators lazy, even for 20-year backfills
+        queue = asyncio.Queue(maxsize=self.per_host * 2)
+        workers = [asyncio.create_task(self.fetch_worker(session, queue)) for _ in range(self.per_host)]
+        # A refresh fetches the units newer than the mark again, whether done or not
+        done = self.checkpoint.get_done_units(scraper.name) if scraper.known_links is None else set()
+        if done:
+            logging.info(f"Resuming {scraper.name}, {len(done)} units already done.")
+        discovered = self.discovered[scraper.name] = collections.deque()
+        units = scraper.get_page_urls()
+        while True:
+            for unit, url in units:
+                if self.stats[scraper.name]["stopped"]:
+                    break
+                if str(unit) not in done:
+                    self.stats[scraper.name]["queued"] += 1
+                    await queue.put((scraper, unit, url))
+            # Units are only done once parsed, the pages fetched so far have added their discoveries
+            await queue.join()
+            if not discovered:
+                break
+            units, discovered = discovered, collections.deque()
+            self.discovered[scraper.name] = discovered
+        for task in workers:
+            task.cancel()
+        await asyncio.gather(*workers, return_exceptions=True)
+        self.stats[scraper.name]["fetched"] = True
+
+    def log_progress(self):
+        """
+        Log the pages, rows and throughput of every site and of the whole crawl.
+        """
+        elapsed = max(time.monotonic() - self.started, 1e-9)
+        total_pages = total_rows = 0
+        for name, stats in self.stats.items():
+            total_pages += stats["pages"]
+            total_rows += stats["rows"]
+            finished = stats["fetched"] and not stats["parsing"]
+            state = "done" if finished else f"{stats['pages'] + stats['errors']}/{stats['queued']}"
+            logging.info(
+                f"{name:<26} {state:>13} pages, {stats['rows']:>7} rows, "
+                f"{stats['errors']:>4} errors, {stats['pages'] / elapsed:6.2f} pages/s"
+            )
+        logging.info(
+            f"{'total':<26} {total_pages:>13} pages, {total_rows:>7} rows in {elapsed:.0f}s, "
+            f"{total_pages / elapsed:.2f} pages/s, {total_rows / elapsed:.1f} rows/s"
+        )
+
+    def save_marks(self, scrapers):
+        """
+        Store the newest unit of every site crawled to the end as its high-water mark.
+        """
+        if self.writer.pending_units:
+            return  # Some rows are not on disk, a mark could skip them
+        for scraper in scrapers:
+            stats = self.stats[scraper.name]
+            if not stats["fetched"] or stats["newest"] is None:
+                continue
+            unit, links = stats["newest"]
+            mark = self.checkpoint.get_mark(scraper.name)
+            if mark is None or scraper.get_unit_key(unit) >= scraper.get_unit_key(mark[0]):
+                self.checkpoint.set_mark(scraper.name, unit, links)
+
+    async def report_progress(self):
+        while True:
+            await asyncio.sleep(self.progress_interval)
+            self.log_progress()
+
+    async def crawl(self, *scrapers):
+        """
+        Crawl several scrapers at once and wait until all are done.
+
+        Every site gets its own queue and per_host workers, so a slow or rate-limited host never
+        holds workers that other hosts could use, while `concurrency` caps the requests in flight
+        over all hosts. The crawl then takes about as long as its slowest site.
+
+        Fetched pages go through a bounded queue to parse_workers processes, parsing uses every
+        core without blocking the event loop, and a full queue pauses the fetchers.
+        """
+        self.started = time.monotonic()
+        self.stats = {
+            scraper.name: {"queued": 0, "pages": 0, "rows": 0, "errors": 0, "parsing": 0, "fetched": False,
+                           "stopped": False, "newest": None}
+            for scraper in scrapers
+        }
+        # Semaphores belong to the event loop of this crawl
+        self.budget = asyncio.Semaphore(self.concurrency)
+        self.host_slots = {}
+        self.discovered = {}
+        parse_tasks = max(1, self.parse_workers * 2)
+        self.parse_queue = asyncio.Queue(maxsize=parse_tasks * 2)
+        async with AsyncExitStack() as stack:
+            session = await stack.enter_async_context(self.session)
+            for scraper in scrapers:
+                if scraper.session is not None:
+                    await stack.enter_async_context(scraper.session)
+            self.pool = None
+            if self.parse_workers:
+                self.pool = stack.enter_context(ProcessPoolExecutor(max_workers=self.parse_workers))
+            # Two tasks per process, one process is never idle waiting for its next page
+            parsers = [asyncio.create_task(self.parse_worker()) for _ in range(parse_tasks)]
+            reporter = asyncio.create_task(self.report_progress())
+            await self.writer.start()
+            try:
+                await asyncio.gather(*(self.crawl_site(session, scraper) for scraper in scrapers))
+                await self.parse_queue.join()
+            finally:
+                for task in parsers + [reporter]:
+                    task.cancel()
+                await asyncio.gather(*parsers, return_exceptions=True)
+                await self.writer.close()
+                self.log_progress()
+        self.save_marks(scrapers)
+
+    def run(self, *scrapers):
+        """
+        Crawl one or more scrapers to completion.
+        """
+        asyncio.run(self.crawl(*scrapers))
@@ -0,0 +1,129 @@
+import logging
+
+
+class ParserBackend:
+    """
+    Base of the parser backends, which provide parse(html), select(node, css) and
+    get_field(article, css, attr) returning None when the field is missing.
+    """
+
+    name = None
+
+    def extract(self, html, selectors):
+        tree = self.parse(html)
+        rows = []
+        for article in self.select(tree, selectors["articles"]):
+            headline = self.get_field(article, selectors["headline"], selectors["headline_attr"])
+            link = self.get_field(article, selectors["link"], selectors["link_attr"])
+            # Articles missing a field (ads, teasers...) are skipped, not the whole page
+            if headline is not None and link is not None:
+                rows.append((headline, link))
+        return rows
+
+
+class SelectolaxParser(ParserBackend):
+    """
+    Parser backed by selectolax's Lexbor engine, the fastest backend.
+    """
+
+    name = "selectolax"
+
+    def __init__(self):
+        from selectolax.lexbor import LexborHTMLParser
+
+        self.parse = LexborHTMLParser
+
+    def select(self, node, css):
+        return node.css(css)
+
+    def get_field(self, article, css, attr):
+        node = article.css_first(css) if css else article
+        if node is None:
+            return None
+        return node.attributes.get(attr) if attr else node.text(deep=True)
+
+
+class LxmlParser(ParserBackend):
+    """
+    Parser backed by lxml, CSS selectors are compiled to XPath once and reused.
+    """
+
+    name = "lxml"
+
+    def __init__(self):
+        import lxml.html
+        from lxml.cssselect import CSSSelector
+
+        self.parse = lxml.html.fromstring
+        self.compile = CSSSelector
+        self.compiled = {}
+
+    def select(self, node, css):
+        if css not in self.compiled:
+            self.compiled[css] = self.compile(css)
+        return self.compiled[css](node)
+
+    def get_field(self, article, css, attr):
+        if css:
+            nodes = self.select(article, css)
+            if not nodes:
+                return None
+            article = nodes[0]
+        return article.get(attr) if attr else article.text_content()
+
+
+class SoupParser(ParserBackend):
+    """
+    Parser backed by BeautifulSoup and the pure-Python html.parser, the slowest but most lenient backend.
+    """
+
+    name = "bs4"
+
+    def __init__(self):
+        from bs4 import BeautifulSoup
+
+        self.soup = BeautifulSoup
+
+    def parse(self, html):
+        return self.soup(html, "html.parser")
+
+    def select(self, node, css):
+        return node.select(css)
+
+    def get_field(self, article, css, attr):
+        node = article.select_one(css) if css else article
+        if node is None:
+            return None
+        return node.get(attr) if attr else node.get_text()
+
+
+# Backends in order of preference, the first one that can be imported is the default
+PARSERS = {parser.name: parser for parser in (SelectolaxParser, LxmlParser, SoupParser)}
+
+_instances = {}
+
+
+def get_parser(name=None):
+    """
+    Return a parser instance by backend name, or the fastest installed backend when name is None.
+
+    Every backend exposes extract(html, selectors) of ParserBackend, where selectors is a dict with:
+      - articles: CSS selector of the elements holding one article each
+      - headline / link: CSS selector relative to an article, None for the article itself
+      - headline_attr / link_attr: attribute to read, None for the text content
+    and returns a list of (headline, link) tuples, skipping articles where a field was not found.
+    """
+    if name and name not in PARSERS:
+        raise ValueError(f"Unknown parser backend {name}, expected one of {', '.join(PARSERS)}.")
+    names = [name] if name else list(PARSERS)
+    for candidate in names:
+        if candidate in _instances:
+            return _instances[candidate]
+        try:
+            _instances[candidate] = PARSERS[candidate]()
+            return _instances[candidate]
+        except ImportError as e:
+            if name:
+                raise
+            logging.debug(f"Parser backend {candidate} is not available: {e}")
+    raise ImportError("No HTML parser backend is installed, install selectolax, lxml or beautifulsoup4.")
@@ -0,0 +1,106 @@
+import asyncio
+import logging
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlsplit
+
+
+def parse_retry_after(value, default=30.0):
+    """
+    Convert a Retry-After header (delay in seconds or HTTP date) to a number of seconds.
+    """
+    if not value:
+        return default
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+        return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+    except (TypeError, ValueError):
+        return default
+
+
+class TokenBucket:
+    """
+    Allow `rate` requests per second on average with bursts of up to `burst` requests.
+    """
+
+    def __init__(self, rate, burst=1):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+        self.lock = None
+        self.loop = None
+
+    def refill(self, now):
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    async def acquire(self):
+        """
+        Wait until a request may be sent and consume a token.
+        """
+        loop = asyncio.get_running_loop()
+        if self.loop is not loop:
+            # Waiters of one host queue up here, waiters of other hosts are not affected
+            self.lock = asyncio.Lock()
+            self.loop = loop
+        async with self.lock:
+            while True:
+                now = time.monotonic()
+                if now < self.blocked_until:
+                    await asyncio.sleep(self.blocked_until - now)
+                    continue
+                self.refill(now)
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+    def block(self, seconds):
+        """
+        Stop handing out tokens for the given number of seconds.
+        """
+        now = time.monotonic()
+        self.blocked_until = max(self.blocked_until, now + seconds)
+        self.tokens = 0
+        self.updated = now
+
+
+class RateLimiter:
+    """
+    Keep one token bucket per host.
+    """
+
+    def __init__(self, rate=1.0, burst=2, host_limits=None):
+        self.rate = rate
+        self.burst = burst
+        # host -> (rate, burst) overrides, e.g. {"www.theonion.com": (2.0, 4)}
+        self.host_limits = host_limits or {}
+        self.buckets = {}
+
+    def get_bucket(self, url, rate=None, burst=None):
+        """
+        Return the bucket of the host of a URL, creating it on first use.
+        """
+        host = urlsplit(url).netloc
+        if host not in self.buckets:
+            default = (rate or self.rate, burst or self.burst)
+            self.buckets[host] = TokenBucket(*self.host_limits.get(host, default))
+        return self.buckets[host]
+
+    async def acquire(self, url, rate=None, burst=None):
+        await self.get_bucket(url, rate, burst).acquire()
+
+    def back_off(self, url, retry_after=None):
+        """
+        Pause a host after it answered 429 / 503, honouring its Retry-After header.
+        """
+        seconds = parse_retry_after(retry_after)
+        logging.warning(f"{urlsplit(url).netloc} asked to slow down, pausing for {seconds:.0f}s.")
+        self.get_bucket(url).block(seconds)
@@ -0,0 +1,89 @@
+import logging
+
+import aiohttp
+
+try:
+    import brotli  # noqa: F401  aiohttp decodes "br" responses when Brotli is installed
+
+    ACCEPT_ENCODING = "gzip, deflate, br"
+except ImportError:
+    ACCEPT_ENCODING = "gzip, deflate"
+
+
+DEFAULT_HEADERS = {
+    "user-agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/90.0.4430.212 Safari/537.36",
+    "accept-encoding": ACCEPT_ENCODING,
+}
+
+
+class SessionPool:
+    """
+    Pooled HTTP session shared by every request of a crawl.
+
+    Connections are kept alive and reused per host, bounded by `limit` overall and
+    `limit_per_host` per host. `timeout` is the total number of seconds a request may take.
+    Pass a SessionPool to a scraper (or to CrawlEngine) to control these settings, and read
+    `stats` afterwards to see how many TCP/TLS handshakes were saved by reuse.
+    """
+
+    def __init__(self, limit=100, limit_per_host=4, timeout=30, keepalive_timeout=30, headers=None):
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.timeout = timeout
+        self.keepalive_timeout = keepalive_timeout
+        self.headers = {**DEFAULT_HEADERS, **(headers or {})}
+        self.session = None
+        self.stats = {"requests": 0, "connections": 0, "reused": 0}
+
+    def get_trace_config(self):
+        """
+        Count requests, new connections and reused connections.
+        """
+
+        async def on_request_start(session, context, params):
+            self.stats["requests"] += 1
+
+        async def on_connection_create_end(session, context, params):
+            self.stats["connections"] += 1
+
+        async def on_connection_reuseconn(session, context, params):
+            self.stats["reused"] += 1
+
+        trace_config = aiohttp.TraceConfig()
+        trace_config.on_request_start.append(on_request_start)
+        trace_config.on_connection_create_end.append(on_connection_create_end)
+        trace_config.on_connection_reuseconn.append(on_connection_reuseconn)
+        return trace_config
+
+    async def open(self):
+        """
+        Create the underlying aiohttp session, it must be called from a running event loop.
+        """
+        if self.session is None or self.session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.limit,
+                limit_per_host=self.limit_per_host,
+                keepalive_timeout=self.keepalive_timeout,
+                ttl_dns_cache=300,
+            )
+            self.session = aiohttp.ClientSession(
+                connector=connector,
+                headers=self.headers,
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+                trace_configs=[self.get_trace_config()],
+            )
+        return self.session
+
+    async def close(self):
+        if self.session is not None and not self.session.closed:
+            await self.session.close()
+            logging.info(
+                f"{self.stats['requests']} requests used {self.stats['connections']} connections "
+                f"({self.stats['reused']} reused)."
+            )
+
+    async def __aenter__(self):
+        return await self.open()
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
@@ -0,0 +1,304 @@
+import functools
+import json
+import logging
+import os
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+from typing import Callable, Optional
+from urllib.parse import urljoin, urlsplit
+
+from .discovery import parse_document
+from .engine import CrawlEngine
+from .parsing import get_parser
+
+
+MONTH_NAMES = ["", "january", "february", "march", "april", "may", "june",
+               "july", "august", "september", "october", "november", "december"]
+
+
+def iter_days(start, end):
+    """
+    Yield every day from start down to end, newest first.
+    """
+    day = start
+    while day >= end:
+        yield day.isoformat(), {"year": day.year, "month": day.month, "day": day.day,
+                                "month_name": MONTH_NAMES[day.month]}
+        day -= timedelta(days=1)
+
+
+def iter_months(start, end):
+    """
+    Yield every month from start down to end, newest first.
+    """
+    year, month = start.year, start.month
+    while (year, month) >= (end.year, end.month):
+        yield f"{year}-{month:02d}", {"year": year, "month": month, "month_name": MONTH_NAMES[month]}
+        year, month = (year, month - 1) if month > 1 else (year - 1, 12)
+
+
+def iter_pages(start, end):
+    """
+    Yield every page number from start to end, in either direction.
+    """
+    step = 1 if end >= start else -1
+    for page in range(start, end + step, step):
+        yield str(page), {"page": page}
+
+
+PAGINATIONS = {"daily": iter_days, "monthly": iter_months, "pages": iter_pages}
+
+
+@dataclass(frozen=True)
+class SiteSpec:
+    """
+    Everything that differs between two sources.
+
+    url is a str.format template filled by the pagination: {year}, {month}, {day} and
+    {month_name} for "daily" / "monthly", {page} for "pages", plus the entries of params.
+    start and end are dates for "daily" / "monthly" and page numbers for "pages", page 1 being
+    the newest listing.
+
+    env maps query parameters read from environment variables, such as API keys, to their
+    variable. They are added to the requests when sent, never to the URLs, which are stored in
+    the checkpoints and the cache and logged. A site whose variables are unset is skipped.
+
+    sitemap is an XML sitemap, sitemap index or RSS / Atom feed listing the articles of the site,
+    crawled instead of the paginated listing when asked to (see discovery.py). sitemap_filter is
+    a regex selecting the child sitemaps of an index holding articles. Sitemaps without titles
+    give headlines rebuilt from URL slugs, without case or punctuation: only some sites have
+    sitemaps, a model could learn the source from them, so they are only crawled on request.
+    """
+
+    name: str
+    url: str
+    pagination: str
+    label: str
+    start: object
+    end: object
+    selectors: dict = field(default_factory=dict)
+    rate: float = 1.0
+    params: dict = field(default_factory=dict)
+    # Optional hooks: clean(value) post-processes both fields, extract(html) replaces the CSS extraction
+    clean: Optional[Callable] = None
+    extract: Optional[Callable] = None
+    sitemap: Optional[str] = None
+    sitemap_filter: Optional[str] = None
+    env: dict = field(default_factory=dict)
+
+    def get_missing_env(self):
+        """
+        Return the environment variables the site needs that are unset.
+        """
+        return [variable for variable in self.env.values() if not os.environ.get(variable)]
+
+    def get_request_params(self):
+        return {param: os.environ.get(variable, "") for param, variable in self.env.items()}
+
+    @property
+    def home(self):
+        parts = urlsplit(self.url)
+        return f"{parts.scheme}://{parts.netloc}/"
+
+
+def css(articles, headline="a", link="a", headline_attr=None, link_attr="href"):
+    """
+    Build a selectors spec, see parsing.get_parser.
+    """
+    return {"articles": articles, "headline": headline, "headline_attr": headline_attr,
+            "link": link, "link_attr": link_attr}
+
+
+def parse_prop(value):
+    """
+    Decode a Vue prop holding a JSON string, such as "\"Headline\"".
+    """
+    try:
+        return str(json.loads(value))
+    except ValueError:
+        return value.strip("\"'")
+
+
+def extract_nytimes(html):
+    """
+    Read the headlines and links out of a New York Times Archive API response.
+    """
+    try:
+        docs = json.loads(html)["response"]["docs"][:500]  # At most 500 articles per month
+    except (ValueError, KeyError) as e:
+        logging.error(f"Unexpected Archive API response: {e}")
+        return []
+    return [
+        (doc["headline"]["main"], doc["web_url"])
+        for doc in docs
+        if doc.get("headline", {}).get("main") and doc.get("web_url")
+    ]
+
+
+# Post sitemaps of WordPress, from the core sitemap or Yoast SEO, which wp-sitemap.xml redirects to
+WORDPRESS_POSTS = r"/(wp-sitemap-posts-post-\d+|post-sitemap\d*)\.xml"
+
+
+SITES = {spec.name: spec for spec in [
+    # Sarcastic sources
+    SiteSpec("theonion.com", "https://www.theonion.com/sitemap/{year}/{month_name}/{day}", "daily", "1",
+             date(2021, 6, 7), date(2015, 1, 1), css("h4.js_sitemap-article")),
+    SiteSpec("newsthump.com", "https://newsthump.com/{year}/{month:02d}/{day:02d}/", "daily", "1",
+             date(2021, 6, 3), date(1999, 1, 1), css("h2.entry-title")),
+    SiteSpec("rochdaleherald.co.uk", "https://rochdaleherald.co.uk/{year}/{month:02d}/{day:02d}", "daily", "1",
+             date(2021, 6, 30), date(2015, 1, 1), css("h3.entry-title.td-module-title", headline_attr="title")),
+    SiteSpec("cracked.com", "https://www.cracked.com/funny-articles.html?date_year={year}&date_month={month}",
+             "monthly", "1", date(2021, 6, 1), date(2000, 1, 1), css("h2.title"), rate=0.5),
+    SiteSpec("thedailywtf.com", "https://thedailywtf.com/articles/{year}/{month}", "monthly", "1",
+             date(2021, 6, 1), date(2000, 1, 1), css("div.article-content", headline="h2")),
+    SiteSpec("babylonbee.com", "https://babylonbee.com/news?page={page}", "pages", "1", 1, 353,
+             css("article-card", headline=None, link=None, headline_attr=":title", link_attr=":path"),
+             rate=0.5, clean=parse_prop),
+    SiteSpec("burrardstreetjournal.com", "https://www.burrardstreetjournal.com/page/{page}", "pages", "1", 1, 46,
+             css("div.td-block-span6", headline="h3.entry-title.td-module-title"), rate=0.5,
+             sitemap="https://www.burrardstreetjournal.com/wp-sitemap.xml", sitemap_filter=WORDPRESS_POSTS),
+    SiteSpec("clickhole.com", "https://clickhole.com/page/{page}/", "pages", "1", 1, 1171,
+             css("article", headline="h2.post_title a", link="h2.post_title a"), rate=0.5,
+             sitemap="https://clickhole.com/wp-sitemap.xml", sitemap_filter=WORDPRESS_POSTS),
+    SiteSpec("newyorker.com", "https://www.newyorker.com/humor/borowitz-report/page/{page}", "pages", "1", 1, 143,
+             css("div.River__riverItemContent___2hXMG", headline="h4.River__hed___re6RP")),
+    SiteSpec("thebeaverton.com", "https://www.thebeaverton.com/page/{page}", "pages", "1", 1, 779,
+             css('h3[itemprop="headline"]'),
+             sitemap="https://www.thebeaverton.com/wp-sitemap.xml", sitemap_filter=WORDPRESS_POSTS),
+    SiteSpec("thedailymash.co.uk", "https://www.thedailymash.co.uk/politics?page={page}", "pages", "1", 1, 32,
+             css("a.font-serif.font-bold.text-xl.text-brand", headline=None, link=None)),
+    SiteSpec("thepoke.co.uk", "https://www.thepoke.co.uk/category/news/page/{page}", "pages", "1", 1, 1000,
+             css("article.boxgrid", headline="p"),
+             sitemap="https://www.thepoke.co.uk/wp-sitemap.xml", sitemap_filter=WORDPRESS_POSTS),
+    # Non-sarcastic sources
+    SiteSpec("huffpost.com", "https://www.huffpost.com/archive/{year}-{month:02d}-{day:02d}", "daily", "0",
+             date(2021, 6, 7), date(2020, 1, 1),
+             css("div.card__headline", headline="div.card__headline__text", link="a.card__link.yr-card-headline")),
+    SiteSpec("nytimes.com", "https://api.nytimes.com/svc/archive/v1/{year}/{month}.json",
+             "monthly", "0", date(2021, 6, 1), date(2017, 1, 1),
+             env={"api-key": "NYT_API_KEY"},
+             extract=extract_nytimes),
+    SiteSpec("euronews.com", "https://www.euronews.com/news/asia?p={page}", "pages", "0", 415, 1,
+             css("div.m-object__description", headline_attr="title")),
+    SiteSpec("theguardian.com", "https://www.theguardian.com/world?page={page}", "pages", "0", 300, 1,
+             css("div.fc-item__container")),
+    SiteSpec("time.com", "https://time.com/html-sitemap/time-section-world/part/{page}", "pages", "0", 210, 100,
+             css("div.ti-sitemap-list li")),
+]}
+
+
+class SiteScraper:
+    """
+    Scraper of any registered site, driven by its SiteSpec.
+    """
+
+    def __init__(self, spec, start=None, end=None, rate=None, session=None, parser=None, since=None,
+                 sitemaps=False):
+        if isinstance(spec, str):
+            spec = SITES[spec]
+        self.spec = spec
+        self.name = spec.name
+        self.start = spec.start if start is None else start
+        self.end = spec.end if end is None else end
+        self.rate = rate or spec.rate
+        self.session = session
+        self.parser_name = parser
+        self.parser = get_parser(parser)
+        self.discovers = sitemaps and spec.sitemap is not None
+        self.request_params = spec.get_request_params()
+        self.known_links = None
+        if since is not None:
+            self.refresh(*since)
+
+    def get_unit_key(self, unit):
+        """
+        Return the sort key of a unit, newer units sort last.
+        """
+        if self.spec.pagination == "pages" and not self.discovers:
+            return -int(unit)
+        return unit  # ISO dates and months sort in time order
+
+    def refresh(self, unit, links):
+        """
+        Crawl only what is newer than the (unit, links) high-water mark of the last crawl.
+
+        Archives are crawled from today down to the mark, listings from page 1 until a page
+        holds one of the links. Sitemaps need no mark, their unchanged parts are skipped anyway.
+        """
+        if self.discovers:
+            return
+        if self.spec.pagination == "daily":
+            self.start, self.end = date.today(), date.fromisoformat(unit)
+        elif self.spec.pagination == "monthly":
+            self.start, self.end = date.today(), date.fromisoformat(f"{unit}-01")
+        else:
+            self.start, self.end = 1, max(self.spec.start, self.spec.end)
+        self.known_links = set(links)
+
+    def get_page_urls(self):
+        """
+        Yield (unit, url) for every page of the site between start and end.
+
+        A sitemap is fetched again every day, the child sitemaps it lists are units named after
+        their URL and last modification, so only new or changed ones are crawled again.
+        """
+        if self.discovers:
+            yield date.today().isoformat(), self.spec.sitemap
+            return
+        for unit, values in PAGINATIONS[self.spec.pagination](self.start, self.end):
+            yield unit, self.spec.url.format(**values, **self.spec.params)
+
+    def get_articles(self, html):
+        """
+        Extract the (headline, link) pairs of a page.
+        """
+        if self.spec.extract is not None:
+            return self.spec.extract(html)
+        return self.parser.extract(html, self.spec.selectors)
+
+    def extract_headline_data(self, articles):
+        """
+        Normalise the extracted pairs into [headline, link, label] rows.
+        """
+        results = []
+        try:
+            for headline, article_link in articles:
+                if self.spec.clean is not None:
+                    headline, article_link = self.spec.clean(headline), self.spec.clean(article_link)
+                # Collapse inner whitespace, a newline in a headline would break the one-row-per-line format
+                headline = " ".join(headline.split())
+                article_link = urljoin(self.spec.home, article_link.strip()).rstrip("/")
+                if headline:
+                    results.append([headline, article_link, self.spec.label])
+        except Exception as e:
+            logging.error(f"Error extracting headline data for {self.name}: {e}")
+        return results
+
+    @property
+    def parse_job(self):
+        """
+        Picklable callable turning a page into rows, run in a parser process by the engine.
+        """
+        return functools.partial(parse_page, self.spec, self.parser_name, self.discovers)
+
+    def scrape(self, engine=None):
+        (engine or CrawlEngine()).run(self)
+
+
+def parse_page(spec, parser_name, discovers, html):
+    """
+    Turn a page of a site into [headline, link, label] rows.
+
+    With discovers, the page is a sitemap or a feed and the child sitemaps it lists are returned
+    with the rows, as (unit, url) pairs.
+    """
+    scraper = SiteScraper(spec, parser=parser_name)
+    if not discovers:
+        return scraper.extract_headline_data(scraper.get_articles(html))
+    articles, sitemaps = parse_document(html, spec.sitemap_filter)
+    # Without a last modification, a child sitemap is crawled again every day
+    today = date.today().isoformat()
+    return scraper.extract_headline_data(articles), [
+        (f"{url}|{lastmod or today}", url) for url, lastmod in sitemaps
+    ]
+
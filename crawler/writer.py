@@ -0,0 +1,171 @@
+import asyncio
+import logging
+import os
+import time
+from datetime import datetime, timezone
+
+
+class RecordWriter:
+    """
+    Single writer of the rows of every site.
+
+    Workers only enqueue rows, one task owns the output files, so rows of concurrent pages
+    never interleave. Rows are buffered and written in one call per file when `batch_size`
+    rows are pending or `flush_interval` seconds have passed. Every flush is fsynced before
+    the units it contains are marked done in the checkpoint store, so a crash can lose the
+    last batch but never record a unit whose rows are not on disk.
+
+    With `format="arrow"` each flush appends Arrow part files to the columnar corpus (see
+    corpus.py), with `format="txt"` lines `headline|link|label` to `<site>.txt` files. Rows whose
+    link is already in the output are dropped, so a refresh or a restarted crawl never writes
+    a row twice.
+
+    If the writer task dies, write() and close() raise its exception instead of waiting forever.
+    """
+
+    FORMATS = ("arrow", "txt")
+
+    def __init__(self, output_dir="datasets/corpus", checkpoint=None, batch_size=1000, flush_interval=2.0, format="arrow"):
+        if format not in self.FORMATS:
+            raise ValueError(f"Unknown output format {format!r}, expected one of {', '.join(self.FORMATS)}")
+        self.output_dir = output_dir
+        self.format = format
+        self.checkpoint = checkpoint
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.files = {}
+        # site -> links already in the output, read on the first flush of the site
+        self.links = {}
+        self.buffers = {}
+        self.pending_units = []
+        self.pending_rows = 0
+        self.queue = None
+        self.task = None
+
+    def get_path(self, site):
+        return os.path.join(self.output_dir, f"{site}.txt")
+
+    async def start(self):
+        self.queue = asyncio.Queue(maxsize=10000)
+        self.task = asyncio.create_task(self.run())
+
+    def check_task(self):
+        """
+        Raise the exception the writer task died of, if it did.
+        """
+        if self.task is not None and self.task.done() and not self.task.cancelled():
+            self.task.result()
+            raise RuntimeError("The writer task stopped")
+
+    async def write(self, site, unit, url, rows):
+        """
+        Enqueue the rows of a finished unit.
+        """
+        self.check_task()
+        await self.queue.put((site, unit, url, rows))
+
+    async def run(self):
+        last_flush = time.monotonic()
+        while True:
+            timeout = max(0.0, self.flush_interval - (time.monotonic() - last_flush))
+            try:
+                site, unit, url, rows = await asyncio.wait_for(self.queue.get(), timeout)
+                crawled_at = datetime.now(timezone.utc).replace(microsecond=0)
+                self.buffers.setdefault(site, []).extend((*row, unit, crawled_at) for row in rows)
+                self.pending_units.append((site, unit, url, rows))
+                self.pending_rows += len(rows)
+                self.queue.task_done()
+            except asyncio.TimeoutError:
+                pass
+            if self.pending_rows >= self.batch_size or time.monotonic() - last_flush >= self.flush_interval:
+                self.flush()
+                last_flush = time.monotonic()
+
+    def get_written_links(self, site):
+        """
+        Return the set of the links of a site already in the output, read from disk the first time.
+        """
+        if site not in self.links:
+            if self.format == "arrow":
+                from .corpus import load_corpus
+
+                links = load_corpus(self.output_dir, ["link"], [site])["link"].to_pylist()
+            elif os.path.exists(self.get_path(site)):
+                with open(self.get_path(site), "r", encoding="utf-8") as file:
+                    links = [line.rsplit("|", 2)[1] for line in file if line.count("|") >= 2]
+            else:
+                links = []
+            self.links[site] = set(links)
+        return self.links[site]
+
+    def flush(self):
+        """
+        Write the buffered rows, fsync the files, then checkpoint the units they belong to.
+        """
+        if not self.pending_units:
+            return
+        try:
+            for site, records in self.buffers.items():
+                if not records:
+                    continue
+                links = self.get_written_links(site)
+                new_links = set()
+                new_records = []
+                for record in records:
+                    link = record[1]
+                    if link not in links and link not in new_links:
+                        new_links.add(link)
+                        new_records.append(record)
+                if new_records:
+                    if self.format == "arrow":
+                        self.write_arrow(site, new_records)
+                    else:
+                        self.write_text(site, new_records)
+                links |= new_links
+                records.clear()
+            if self.checkpoint is not None:
+                self.checkpoint.mark_many_done(self.pending_units)
+        except Exception as e:
+            # Disk, Arrow or checkpoint errors: the units stay pending and are retried by the next flush
+            logging.error(f"Error writing to {self.output_dir}: {e}")
+            return
+        self.pending_units = []
+        self.pending_rows = 0
+
+    def write_text(self, site, records):
+        if site not in self.files:
+            os.makedirs(self.output_dir, exist_ok=True)
+            self.files[site] = open(self.get_path(site), "a", encoding="utf-8")
+        file = self.files[site]
+        file.write("".join(f"{headline}|{link}|{label}\n" for headline, link, label, _, _ in records))
+        file.flush()
+        os.fsync(file.fileno())
+
+    def write_arrow(self, site, records):
+        # pyarrow is only needed for the columnar output
+        from .corpus import records_to_table, write_table
+
+        write_table(self.output_dir, records_to_table(site, records))
+
+    async def close(self):
+        """
+        Write everything still queued and close the files.
+        """
+        if self.task is not None:
+            # join() alone would wait forever for rows a dead task never takes
+            joined = asyncio.ensure_future(self.queue.join())
+            await asyncio.wait([joined, self.task], return_when=asyncio.FIRST_COMPLETED)
+            joined.cancel()
+            task, self.task = self.task, None
+            if task.done():
+                for file in self.files.values():
+                    file.close()
+                self.files = {}
+                task.result()
+                raise RuntimeError("The writer task stopped")
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+        self.flush()
+        for file in self.files.values():
+            file.close()
+        self.files = {}
@@ -0,0 +1,318 @@
+"""
+Build datasets/train.csv and datasets/test.csv from the crawled per-site outputs.
+
+Every site is a shard read from the Arrow corpus (datasets/corpus) and the legacy txt files
+(datasets/raw/<site>.txt). Shards are normalized in parallel and cached under
+datasets/build/shards, a manifest records the inputs each one was built from, so only
+shards whose inputs changed are rebuilt. Rows are split by a hash of their link, a headline
+lands in the same split on every build and on every machine. Exact and near duplicates are
+then removed across all sites (see dedup.py), keeping the earlier row of every duplicate pair.
+
+    python dataset.py --test-size 0.2 --workers 8
+"""
+import argparse
+import csv
+import glob
+import hashlib
+import json
+import logging
+import os
+import re
+import time
+import unicodedata
+from concurrent.futures import ProcessPoolExecutor
+from urllib.parse import urlsplit, urlunsplit
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+
+from convert import ConversionReport, TextWriter, read_txt
+from crawler.corpus import get_parts, load_corpus
+from dedup import deduplicate, get_signatures, hash_links
+
+
+# Bump when the normalization changes, every shard is rebuilt
+VERSION = 2
+SHARD_SCHEMA = pa.schema([
+    ("headline", pa.string()),
+    ("link", pa.string()),
+    ("link_hash", pa.uint64()),
+    ("label", pa.int8()),
+    ("site", pa.string()),
+    ("split", pa.string()),
+])
+WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_headline(headline):
+    return WHITESPACE.sub(" ", unicodedata.normalize("NFKC", headline)).strip()
+
+
+def normalize_link(link):
+    """
+    Canonical form of a link: https, lower-case host without www., no fragment or trailing slash.
+    """
+    parts = urlsplit(link.strip())
+    host = parts.netloc.lower()
+    if host.startswith("www."):
+        host = host[4:]
+    return urlunsplit(("https", host, parts.path.rstrip("/"), parts.query, ""))
+
+
+def get_split(link, test_size):
+    """
+    Return "test" for a `test_size` fraction of links, chosen by hash rather than at random.
+    """
+    digest = hashlib.blake2b(link.encode("utf-8"), digest_size=8).digest()
+    return "test" if int.from_bytes(digest, "big") / 2 ** 64 < test_size else "train"
+
+
+def get_inputs(site, corpus_dir, raw_dir):
+    """
+    Return the input files of a site with their size and modification time.
+    """
+    paths = get_parts(corpus_dir, [site])
+    raw_path = os.path.join(raw_dir, f"{site}.txt")
+    if os.path.exists(raw_path):
+        paths.append(raw_path)
+    inputs = []
+    for path in paths:
+        stat = os.stat(path)
+        inputs.append([path, stat.st_size, stat.st_mtime_ns])
+    return inputs
+
+
+def get_sites(corpus_dir, raw_dir):
+    sites = {os.path.basename(path)[len("site="):] for path in glob.glob(os.path.join(corpus_dir, "site=*"))}
+    sites.update(os.path.basename(path)[:-len(".txt")] for path in glob.glob(os.path.join(raw_dir, "*.txt")))
+    return sorted(sites)
+
+
+def read_site(site, corpus_dir, raw_dir, report):
+    """
+    Yield (headline, link, label) chunks of a site from every input.
+    """
+    table = load_corpus(corpus_dir, ["headline", "link", "label"], [site])
+    for batch in table.to_batches(max_chunksize=50000):
+        columns = batch.to_pydict()
+        yield list(zip(columns["headline"], columns["link"], columns["label"]))
+    raw_path = os.path.join(raw_dir, f"{site}.txt")
+    if os.path.exists(raw_path):
+        yield from read_txt(raw_path, 50000, report)
+
+
+def build_shard(site, corpus_dir, raw_dir, shard_path, test_size):
+    """
+    Normalize the rows of a site, assign their split and write the shard with the MinHash
+    signatures of its headlines. Returns its statistics.
+    """
+    report = ConversionReport()
+    headlines, links, labels, splits = [], [], [], []
+    for chunk in read_site(site, corpus_dir, raw_dir, report):
+        for headline, link, label in chunk:
+            headline = normalize_headline(headline)
+            if not headline or not link:
+                report.add_malformed(0, f"{headline}|{link}|{label}")
+                continue
+            link = normalize_link(link)
+            headlines.append(headline)
+            links.append(link)
+            labels.append(label)
+            splits.append(get_split(link, test_size))
+
+    table = pa.table(
+        [headlines, links, hash_links(links), labels, [site] * len(headlines), splits], schema=SHARD_SCHEMA
+    )
+    temp_path = shard_path + ".tmp"
+    with pa.OSFile(temp_path, "wb") as sink:
+        with pa.ipc.new_file(sink, SHARD_SCHEMA) as writer:
+            writer.write_table(table)
+    os.replace(temp_path, shard_path)
+    np.save(get_signature_path(shard_path), get_signatures(headlines))
+
+    stats = {"rows": len(headlines), "malformed": report.malformed, "train": 0, "test": 0, "labels": {}}
+    for label, split in zip(labels, splits):
+        stats[split] += 1
+        stats["labels"][str(label)] = stats["labels"].get(str(label), 0) + 1
+    return stats
+
+
+def get_signature_path(shard_path):
+    return shard_path[:-len(".arrow")] + ".minhash.npy"
+
+
+def read_shard(path):
+    return pa.ipc.open_file(pa.memory_map(path, "r")).read_all()
+
+
+class DatasetBuilder:
+    """
+    Incremental build of the train and test sets from the per-site shards.
+    """
+
+    def __init__(self, corpus_dir="datasets/corpus", raw_dir="datasets/raw", output_dir="datasets",
+                 test_size=0.2, workers=None, dedup_threshold=0.8):
+        self.corpus_dir = corpus_dir
+        self.raw_dir = raw_dir
+        self.output_dir = output_dir
+        self.build_dir = os.path.join(output_dir, "build")
+        self.shard_dir = os.path.join(self.build_dir, "shards")
+        self.manifest_path = os.path.join(self.build_dir, "manifest.json")
+        self.test_size = test_size
+        self.workers = workers or os.cpu_count() or 1
+        self.dedup_threshold = dedup_threshold
+
+    @property
+    def config(self):
+        return {"version": VERSION, "test_size": self.test_size}
+
+    def get_shard_path(self, site):
+        return os.path.join(self.shard_dir, f"{site}.arrow")
+
+    def load_manifest(self):
+        try:
+            with open(self.manifest_path, "r", encoding="utf-8") as file:
+                return json.load(file)
+        except (OSError, ValueError):
+            return {"shards": {}}
+
+    def save_manifest(self, manifest):
+        temp_path = self.manifest_path + ".tmp"
+        with open(temp_path, "w", encoding="utf-8") as file:
+            json.dump(manifest, file, indent=2, sort_keys=True)
+        os.replace(temp_path, self.manifest_path)
+
+    def get_stale_sites(self, manifest, sites, force=False):
+        """
+        Return the sites whose inputs or build configuration changed since the last build.
+        """
+        stale = {}
+        for site in sites:
+            inputs = get_inputs(site, self.corpus_dir, self.raw_dir)
+            entry = manifest["shards"].get(site)
+            if (force or entry is None or entry["inputs"] != inputs or entry["config"] != self.config
+                    or not os.path.exists(self.get_shard_path(site))):
+                stale[site] = inputs
+        return stale
+
+    def build_shards(self, force=False):
+        """
+        Rebuild the stale shards in parallel and return the manifest.
+        """
+        os.makedirs(self.shard_dir, exist_ok=True)
+        manifest = self.load_manifest()
+        sites = get_sites(self.corpus_dir, self.raw_dir)
+        for site in set(manifest["shards"]) - set(sites):
+            # Site with no input left
+            del manifest["shards"][site]
+            if os.path.exists(self.get_shard_path(site)):
+                os.remove(self.get_shard_path(site))
+
+        stale = self.get_stale_sites(manifest, sites, force)
+        logging.info(f"{len(stale)} of {len(sites)} shards to rebuild.")
+        with ProcessPoolExecutor(max_workers=min(self.workers, max(1, len(stale)))) as pool:
+            futures = {
+                site: pool.submit(build_shard, site, self.corpus_dir, self.raw_dir,
+                                  self.get_shard_path(site), self.test_size)
+                for site in stale
+            }
+            for site, future in futures.items():
+                stats = future.result()
+                manifest["shards"][site] = {"inputs": stale[site], "config": self.config, "stats": stats}
+                logging.info(f"Built {site}: {stats['rows']} rows, {stats['malformed']} malformed.")
+        self.save_manifest(manifest)
+        return manifest
+
+    def deduplicate(self, manifest):
+        """
+        Return a mask of the rows to keep of every site, and the DedupReport.
+        """
+        sites = sorted(manifest["shards"])
+        tables = [read_shard(self.get_shard_path(site)).select(["link_hash", "label", "split"]) for site in sites]
+        table = pa.concat_tables(tables) if tables else SHARD_SCHEMA.empty_table()
+        signatures = [np.load(get_signature_path(self.get_shard_path(site)), mmap_mode="r") for site in sites]
+        keep, report = deduplicate(
+            table["link_hash"].to_numpy(),
+            np.concatenate(signatures) if signatures else np.empty((0, 0), dtype=np.uint32),
+            table["split"].to_numpy(zero_copy_only=False),
+            table["label"].to_numpy(),
+            self.dedup_threshold,
+        )
+        masks, start = {}, 0
+        for site, site_table in zip(sites, tables):
+            masks[site] = keep[start:start + site_table.num_rows]
+            start += site_table.num_rows
+        logging.info(f"Deduplication: {report}.")
+        return masks, report
+
+    def write_splits(self, manifest, masks=None):
+        """
+        Write train.csv and test.csv shard by shard, in site order, keeping the rows of `masks`.
+        """
+        writers = {split: TextWriter(os.path.join(self.output_dir, f"{split}.csv.tmp"), "csv") for split in ("train", "test")}
+        try:
+            for site in sorted(manifest["shards"]):
+                table = read_shard(self.get_shard_path(site))
+                if masks is not None:
+                    table = table.filter(pa.array(masks[site]))
+                for split, writer in writers.items():
+                    part = table.filter(pc.equal(table["split"], split))
+                    for batch in part.to_batches(max_chunksize=50000):
+                        columns = batch.to_pydict()
+                        writer.write(list(zip(columns["headline"], columns["link"], columns["label"])))
+        finally:
+            for writer in writers.values():
+                writer.close()
+        for split in writers:
+            os.replace(os.path.join(self.output_dir, f"{split}.csv.tmp"), os.path.join(self.output_dir, f"{split}.csv"))
+
+    def write_stats(self, manifest, masks=None):
+        """
+        Write the label counts of every site and split to site_stats.csv, before deduplication.
+        """
+        path = os.path.join(self.output_dir, "site_stats.csv")
+        with open(path, "w", encoding="utf-8", newline="") as file:
+            writer = csv.writer(file)
+            writer.writerow(["Site", "Rows", "Train", "Test", "Label 0", "Label 1", "Malformed", "Duplicates"])
+            for site, entry in sorted(manifest["shards"].items()):
+                stats = entry["stats"]
+                duplicates = int((~masks[site]).sum()) if masks is not None else 0
+                writer.writerow([site, stats["rows"], stats["train"], stats["test"], stats["labels"].get("0", 0),
+                                 stats["labels"].get("1", 0), stats["malformed"], duplicates])
+
+    def build(self, force=False):
+        start = time.perf_counter()
+        manifest = self.build_shards(force)
+        masks = None
+        if self.dedup_threshold is not None:
+            masks, report = self.deduplicate(manifest)
+            manifest["dedup"] = dict(vars(report), threshold=self.dedup_threshold)
+            self.save_manifest(manifest)
+        self.write_splits(manifest, masks)
+        self.write_stats(manifest, masks)
+        rows = sum(entry["stats"]["rows"] for entry in manifest["shards"].values())
+        logging.info(f"Built {rows} rows from {len(manifest['shards'])} sites in {time.perf_counter() - start:.1f}s.")
+        return manifest
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--corpus-dir", default="datasets/corpus", help="Arrow corpus written by the crawler")
+    parser.add_argument("--raw-dir", default="datasets/raw", help="directory of legacy <site>.txt files")
+    parser.add_argument("--output-dir", default="datasets", help="directory of train.csv, test.csv and site_stats.csv")
+    parser.add_argument("--test-size", type=float, default=0.2, help="fraction of the links in the test set")
+    parser.add_argument("--workers", type=int, help="shard builder processes, every core by default")
+    parser.add_argument("--force", action="store_true", help="rebuild every shard")
+    parser.add_argument("--dedup-threshold", type=float, default=0.8, help="similarity above which headlines are near duplicates")
+    parser.add_argument("--no-dedup", action="store_true", help="keep duplicate rows")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+    builder = DatasetBuilder(args.corpus_dir, args.raw_dir, args.output_dir, args.test_size, args.workers,
+                             None if args.no_dedup else args.dedup_threshold)
+    builder.build(args.force)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,197 @@
+"""
+Exact and near-duplicate detection of headlines.
+
+Rows sharing a normalized link are exact duplicates. Near duplicates, e.g. the same wire story
+published by two sites, are found among the other rows with MinHash signatures of character
+shingles and locality sensitive hashing: signatures are cut into bands, only rows sharing a whole
+band are compared, so the work grows with the number of rows rather than the number of pairs.
+A row is removed for a pair of rows above the similarity threshold, never for a chain of them.
+"""
+import hashlib
+import re
+import zlib
+
+import numpy as np
+
+
+NUM_PERM = 128
+BANDS = 16
+SHINGLE_SIZE = 5
+# Rows compared with each row of a band bucket, bounds the pairs of huge buckets
+MAX_CANDIDATES = 100
+NON_ALPHANUMERIC = re.compile(r"[^0-9a-z ]+")
+SPACES = re.compile(r" +")
+
+
+def get_permutations(num_perm=NUM_PERM, seed=1):
+    generator = np.random.RandomState(seed)
+    a = generator.randint(0, 2 ** 63, num_perm, dtype=np.uint64) * np.uint64(2) + np.uint64(1)
+    b = generator.randint(0, 2 ** 63, num_perm, dtype=np.uint64)
+    return a, b
+
+
+PERMUTATIONS = get_permutations()
+
+
+def get_shingles(headline):
+    """
+    Return the character shingles of a headline, ignoring case, punctuation and spacing.
+    """
+    text = SPACES.sub(" ", NON_ALPHANUMERIC.sub("", headline.lower())).strip()
+    if len(text) <= SHINGLE_SIZE:
+        return {text}
+    return {text[i:i + SHINGLE_SIZE] for i in range(len(text) - SHINGLE_SIZE + 1)}
+
+
+def get_signatures(headlines, block_size=2000):
+    """
+    Return the (rows, NUM_PERM) uint32 MinHash signatures of a list of headlines.
+    """
+    a, b = PERMUTATIONS
+    signatures = np.empty((len(headlines), NUM_PERM), dtype=np.uint32)
+    for start in range(0, len(headlines), block_size):
+        hashes, offsets = [], []
+        for headline in headlines[start:start + block_size]:
+            offsets.append(len(hashes))
+            hashes.extend(zlib.crc32(shingle.encode("utf-8")) for shingle in get_shingles(headline))
+        if not offsets:
+            continue
+        x = np.array(hashes, dtype=np.uint64)
+        # Multiply-shift hashing, the high 32 bits of (a * x + b) mod 2^64 with an odd a,
+        # avoids the much slower modulo of a prime
+        with np.errstate(over="ignore"):
+            values = ((a[:, None] * x[None, :] + b[:, None]) >> np.uint64(32)).astype(np.uint32)
+        signatures[start:start + len(offsets)] = np.minimum.reduceat(values, offsets, axis=1).T
+    return signatures
+
+
+# Signature of the headlines left empty by normalization, which are never near duplicates
+EMPTY_SIGNATURE = get_signatures([""])[0]
+
+
+def hash_links(links):
+    return np.array(
+        [int.from_bytes(hashlib.blake2b(link.encode("utf-8"), digest_size=8).digest(), "big") for link in links],
+        dtype=np.uint64,
+    )
+
+
+def get_group_pairs(keys):
+    """
+    Return (first, other) index pairs linking every row to the first row with the same key.
+    """
+    order = np.argsort(keys, kind="stable")
+    sorted_keys = keys[order]
+    starts = np.ones(len(keys), dtype=bool)
+    starts[1:] = sorted_keys[1:] != sorted_keys[:-1]
+    first = np.maximum.accumulate(np.where(starts, np.arange(len(keys)), 0))
+    members = ~starts
+    return order[first[members]], order[members]
+
+
+def get_candidate_pairs(keys, window=MAX_CANDIDATES):
+    """
+    Return the (earlier, later) index pairs of rows with the same key, each row paired with
+    the `window` rows of its group before it.
+    """
+    # A stable sort keeps the rows of a group in index order
+    order = np.argsort(keys, kind="stable")
+    sorted_keys = keys[order]
+    earlier, later = [], []
+    for offset in range(1, min(window, len(keys) - 1) + 1):
+        same = sorted_keys[offset:] == sorted_keys[:-offset]
+        if not same.any():
+            break
+        earlier.append(order[:-offset][same])
+        later.append(order[offset:][same])
+    if not earlier:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+    return np.concatenate(earlier), np.concatenate(later)
+
+
+def get_band_keys(signatures, band, rows):
+    # Fold the rows of a band into one 64-bit key, colliding keys are verified afterwards
+    weights = np.arange(1, 2 * rows, 2, dtype=np.uint64) * np.uint64(0x9E3779B97F4A7C15)
+    with np.errstate(over="ignore"):
+        return (signatures[:, band * rows:(band + 1) * rows].astype(np.uint64) * weights).sum(axis=1)
+
+
+class DedupReport:
+    def __init__(self):
+        self.rows = 0
+        self.url_duplicates = 0
+        self.near_duplicates = 0
+        self.cross_split_leaks = 0
+        self.label_conflicts = 0
+
+    @property
+    def removed(self):
+        return self.url_duplicates + self.near_duplicates
+
+    def __str__(self):
+        return (f"{self.removed} of {self.rows} rows removed: {self.url_duplicates} with the same link, "
+                f"{self.near_duplicates} near duplicates, {self.cross_split_leaks} of them across the "
+                f"train/test split, {self.label_conflicts} with a different label")
+
+
+def find_duplicates(link_hashes, signatures, threshold=0.8, bands=BANDS):
+    """
+    Return the index of the row each row duplicates, itself for the rows to keep.
+
+    A row duplicates the first row with the same link. Among the other rows, a row duplicates
+    the first row with the same signature, or else the first row kept before it whose signature
+    agrees on at least `threshold` of the permutations: a row similar to a removed row only is kept.
+    """
+    count = len(link_hashes)
+    duplicate_of = np.arange(count)
+    if not count:
+        return duplicate_of
+    first, other = get_group_pairs(link_hashes)
+    duplicate_of[other] = first
+
+    candidates = np.flatnonzero((duplicate_of == np.arange(count)) & (signatures != EMPTY_SIGNATURE).any(axis=1))
+    # Rows with the same signature follow the first of them, only that one goes through LSH
+    _, first_index, inverse = np.unique(
+        np.asarray(signatures[candidates]), axis=0, return_index=True, return_inverse=True
+    )
+    rows_with_signature, followed = candidates, candidates[first_index[inverse.ravel()]]
+    candidates = candidates[np.sort(first_index)]
+    subset = np.asarray(signatures[candidates])
+    rows = subset.shape[1] // bands
+    pairs = [get_candidate_pairs(get_band_keys(subset, band, rows)) for band in range(bands)]
+    # The same pair usually shares several bands
+    unique = np.unique(np.concatenate([first.astype(np.int64) * len(candidates) + other for first, other in pairs]))
+    first, other = unique // len(candidates), unique % len(candidates)
+    similar = np.empty(len(first), dtype=bool)
+    for start in range(0, len(first), 100000):
+        stop = start + 100000
+        similar[start:stop] = (subset[first[start:stop]] == subset[other[start:stop]]).mean(axis=1) >= threshold
+    first, other = candidates[first[similar]], candidates[other[similar]]
+
+    # In row order, a row's status is final before any later row looks at it
+    order = np.lexsort((first, other))
+    for earlier, later in zip(first[order].tolist(), other[order].tolist()):
+        if duplicate_of[later] == later and duplicate_of[earlier] == earlier:
+            duplicate_of[later] = earlier
+
+    # A row with the signature of a removed row is as similar to the row that removed it
+    duplicate_of[rows_with_signature] = duplicate_of[followed]
+    return duplicate_of
+
+
+def deduplicate(link_hashes, signatures, splits, labels, threshold=0.8):
+    """
+    Return a mask of the rows to keep and a DedupReport.
+
+    Every removed row is counted from the row it duplicates, the pair that removed it.
+    """
+    duplicate_of = find_duplicates(link_hashes, signatures, threshold)
+    keep = duplicate_of == np.arange(len(duplicate_of))
+    removed = ~keep
+    report = DedupReport()
+    report.rows = len(keep)
+    report.url_duplicates = int((link_hashes[removed] == link_hashes[duplicate_of[removed]]).sum())
+    report.near_duplicates = int(removed.sum()) - report.url_duplicates
+    report.cross_split_leaks = int((splits[removed] != splits[duplicate_of[removed]]).sum())
+    report.label_conflicts = int((labels[removed] != labels[duplicate_of[removed]]).sum())
+    return keep, report
@@ -0,0 +1,197 @@
+"""
+Export a trained linear model to plain NumPy arrays, for serving without scikit-learn.
+
+A model saved by train.py is a CountVectorizer + TfidfTransformer + classifier pipeline, whose
+pickle pulls in scikit-learn and a dict of the whole vocabulary. The export holds:
+
+    vocabulary.npy      the sorted 64-bit hashes of the terms, 8 bytes a term however long
+    idf.npy, coef.npy   the IDF and the weight of every term, in the same order
+    meta.json           the intercept and the vectorizer settings
+    preprocessing.json  the preprocessor of the model
+
+LinearScorer memory-maps these files, which only depends on NumPy, and computes
+w . tfidf(x) + b for a batch of preprocessed headlines. SGDClassifier exports its weights,
+MultinomialNB the difference of its class log probabilities, its log odds being linear too.
+
+    python export.py models/sgd
+"""
+import argparse
+import hashlib
+import json
+import logging
+import os
+import re
+import shutil
+
+import numpy as np
+
+
+TOKEN_PATTERN = r"(?u)\b\w\w+\b"
+ARRAYS = ("vocabulary", "idf", "coef")
+
+
+def hash_term(term):
+    return int.from_bytes(hashlib.blake2b(term.encode("utf-8"), digest_size=8).digest(), "big")
+
+
+def get_linear_weights(classifier):
+    """
+    Return the (coef, intercept) of a binary linear classifier, whose margin is positive for classes_[1].
+    """
+    if hasattr(classifier, "feature_log_prob_"):
+        coef = classifier.feature_log_prob_[1] - classifier.feature_log_prob_[0]
+        return coef, classifier.class_log_prior_[1] - classifier.class_log_prior_[0]
+    if hasattr(classifier, "coef_") and classifier.coef_.shape[0] == 1:
+        return classifier.coef_[0], classifier.intercept_[0]
+    raise ValueError(f"{type(classifier).__name__} is not a binary linear classifier.")
+
+
+def export_model(model_dir, output_dir=None):
+    """
+    Export the pipeline.joblib of a model directory to `output_dir` (<model_dir>/export by default).
+    """
+    import joblib
+
+    output_dir = output_dir or os.path.join(model_dir, "export")
+    pipeline = joblib.load(os.path.join(model_dir, "pipeline.joblib"))
+    count, tfidf, classifier = (pipeline.named_steps.get(step) for step in ("vect", "tfidf", "clf"))
+    if count is None or tfidf is None or not hasattr(count, "vocabulary_"):
+        raise ValueError(f"{model_dir} has no CountVectorizer and TfidfTransformer to export.")
+    if count.ngram_range != (1, 1) or count.analyzer != "word" or count.token_pattern != TOKEN_PATTERN:
+        raise ValueError(f"{model_dir} does not use the default word tokens of CountVectorizer.")
+    coef, intercept = get_linear_weights(classifier)
+
+    # A string array would take 4 bytes times the longest term for every term
+    hashes = np.array([hash_term(term) for term in count.vocabulary_], dtype=np.uint64)
+    order = np.argsort(hashes)
+    hashes = hashes[order]
+    if (hashes[1:] == hashes[:-1]).any():
+        raise ValueError(f"Two terms of {model_dir} have the same hash.")
+    columns = np.array(list(count.vocabulary_.values()))[order]
+    arrays = {
+        "vocabulary": hashes,
+        "idf": np.asarray(tfidf.idf_, dtype=np.float64)[columns],
+        "coef": np.asarray(coef, dtype=np.float64)[columns],
+    }
+    meta = {
+        "intercept": float(intercept),
+        "classes": [int(label) for label in classifier.classes_],
+        "norm": tfidf.norm,
+        "sublinear_tf": tfidf.sublinear_tf,
+        "lowercase": count.lowercase,
+        "token_pattern": TOKEN_PATTERN,
+    }
+    temporary = output_dir + ".tmp"
+    shutil.rmtree(temporary, ignore_errors=True)
+    os.makedirs(temporary)
+    for name, array in arrays.items():
+        np.save(os.path.join(temporary, f"{name}.npy"), array)
+    with open(os.path.join(temporary, "meta.json"), "w", encoding="utf-8") as file:
+        json.dump(meta, file)
+    preprocessing = os.path.join(model_dir, "preprocessing.json")
+    if os.path.exists(preprocessing):
+        shutil.copyfile(preprocessing, os.path.join(temporary, "preprocessing.json"))
+    shutil.rmtree(output_dir, ignore_errors=True)
+    os.replace(temporary, output_dir)
+    logging.info(f"Exported {len(hashes)} terms of {model_dir} to {output_dir}.")
+    return output_dir
+
+
+class LinearScorer:
+    """
+    Score preprocessed headlines with an exported model, same margins as the sklearn pipeline.
+    """
+
+    def __init__(self, vocabulary, idf, coef, intercept, classes=(0, 1), norm="l2", sublinear_tf=False,
+                 lowercase=True, token_pattern=TOKEN_PATTERN):
+        self.vocabulary = vocabulary
+        self.idf = idf
+        self.coef = coef
+        self.intercept = intercept
+        self.classes = np.asarray(classes)
+        self.norm = norm
+        self.sublinear_tf = sublinear_tf
+        self.lowercase = lowercase
+        self.pattern = re.compile(token_pattern)
+
+    @classmethod
+    def load(cls, directory):
+        """
+        Memory-map an export, pages of the arrays are read from disk when first used.
+        """
+        with open(os.path.join(directory, "meta.json"), "r", encoding="utf-8") as file:
+            meta = json.load(file)
+        arrays = [np.load(os.path.join(directory, f"{name}.npy"), mmap_mode="r") for name in ARRAYS]
+        return cls(*arrays, meta["intercept"], meta["classes"], meta["norm"], meta["sublinear_tf"],
+                   meta["lowercase"], meta["token_pattern"])
+
+    def get_terms(self, texts):
+        """
+        Return the row and the vocabulary index of every known token of a batch of texts.
+        """
+        rows, tokens = [], []
+        for row, text in enumerate(texts):
+            found = self.pattern.findall(text.lower() if self.lowercase else text)
+            rows.extend([row] * len(found))
+            tokens.extend(found)
+        if not tokens:
+            return np.empty(0, dtype=np.intp), np.empty(0, dtype=np.intp)
+        if self.vocabulary.dtype.kind == "U":
+            tokens = np.array(tokens)  # Exports of terms rather than hashes
+        else:
+            tokens = np.fromiter((hash_term(token) for token in tokens), dtype=np.uint64, count=len(tokens))
+        indices = np.searchsorted(self.vocabulary, tokens)
+        indices[indices == len(self.vocabulary)] = 0
+        known = self.vocabulary[indices] == tokens
+        return np.array(rows, dtype=np.intp)[known], indices[known]
+
+    def decision_function(self, texts):
+        """
+        Return the margins w . tfidf(x) + b of a batch of texts.
+        """
+        rows, terms = self.get_terms(texts)
+        # Term frequencies: one entry per distinct (row, term)
+        keys, tf = np.unique(rows * len(self.vocabulary) + terms, return_counts=True)
+        rows, terms = np.divmod(keys, len(self.vocabulary))
+        tf = tf.astype(np.float64)
+        if self.sublinear_tf:
+            tf = np.log(tf) + 1
+        weights = tf * self.idf[terms]
+        margins = np.bincount(rows, weights * self.coef[terms], minlength=len(texts))
+        if self.norm == "l2":
+            norms = np.sqrt(np.bincount(rows, weights ** 2, minlength=len(texts)))
+        elif self.norm == "l1":
+            norms = np.bincount(rows, np.abs(weights), minlength=len(texts))
+        else:
+            norms = np.ones(len(texts))
+        norms[norms == 0] = 1
+        return margins / norms + self.intercept
+
+    def predict_proba(self, texts):
+        """
+        Return the probability of classes[1] for every text, the sigmoid of its margin.
+        """
+        return 1 / (1 + np.exp(-self.decision_function(texts)))
+
+    def predict(self, texts):
+        return self.classes[(self.decision_function(texts) > 0).astype(int)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("model_dir", nargs="+", help="directories of pipeline.joblib files written by train.py")
+    parser.add_argument("--output-dir", help="export directory, <model_dir>/export by default")
+    args = parser.parse_args()
+
+    if args.output_dir and len(args.model_dir) > 1:
+        parser.error("--output-dir needs a single model_dir")
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+    for model_dir in args.model_dir:
+        try:
+            export_model(model_dir, args.output_dir)
+        except ValueError as e:
+            logging.error(f"Cannot export {model_dir}: {e}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""
+Stateless features for out-of-core training.
+
+The notebook's CountVectorizer builds a vocabulary dict over the whole corpus before the first
+row is transformed. HashingFeaturizer hashes tokens straight into a fixed number of columns
+instead, so any batch can be transformed on its own and a classifier supporting partial_fit
+(SGDClassifier, MultinomialNB...) can learn from a corpus streamed from disk in mini-batches,
+with a memory use independent of the corpus size.
+"""
+import pandas as pd
+from sklearn.feature_extraction.text import HashingVectorizer
+
+
+CLASSES = (0, 1)
+
+
+class HashingFeaturizer:
+    """
+    Hashed term frequencies of preprocessed headlines, l2-normalized like TfidfTransformer's output.
+
+    Counts stay non-negative (no alternate sign) so that MultinomialNB accepts them.
+    """
+
+    def __init__(self, n_features=2 ** 20, ngram_range=(1, 1), norm="l2"):
+        self.n_features = n_features
+        self.ngram_range = tuple(ngram_range)
+        self.norm = norm
+        self.vectorizer = HashingVectorizer(
+            n_features=n_features, ngram_range=self.ngram_range, norm=norm, alternate_sign=False,
+            lowercase=False,  # Preprocessed headlines are lowercase already
+        )
+
+    @property
+    def config(self):
+        return {"n_features": self.n_features, "ngram_range": list(self.ngram_range), "norm": self.norm}
+
+    def transform(self, texts):
+        """
+        Return the CSR matrix of a batch of preprocessed headlines.
+        """
+        return self.vectorizer.transform(texts)
+
+
+def iter_csv_chunks(path, batch_size=10000, skip=0, columns=("Headline", "Label")):
+    """
+    Yield the DataFrames of `batch_size` rows of a CSV file, after its first `skip` rows.
+    """
+    # Row 0 is the header
+    skiprows = range(1, skip + 1) if skip else None
+    yield from pd.read_csv(path, usecols=list(columns), chunksize=batch_size, skiprows=skiprows)
+
+
+def get_batch(chunk, text_column="Headline", label_column="Label"):
+    """
+    Return the (headlines, labels) of a chunk, rows without a headline or a label dropped.
+    """
+    chunk = chunk.dropna(subset=[text_column, label_column])
+    return chunk[text_column].astype(str).tolist(), chunk[label_column].astype(int).to_numpy()
+
+
+def iter_csv_batches(path, batch_size=10000, skip=0, text_column="Headline", label_column="Label"):
+    """
+    Yield (headlines, labels) batches of a CSV file such as datasets/train.csv.
+    """
+    for chunk in iter_csv_chunks(path, batch_size, skip, (text_column, label_column)):
+        yield get_batch(chunk, text_column, label_column)
+
+
+def partial_fit_batches(classifier, batches, featurizer, preprocessor=None, classes=CLASSES):
+    """
+    Update a classifier with every (headlines, labels) batch, return the number of rows seen.
+
+    Headlines are preprocessed first when a Preprocessor is given.
+    """
+    rows = 0
+    for headlines, labels in batches:
+        if preprocessor is not None:
+            headlines = preprocessor.transform(headlines)
+        classifier.partial_fit(featurizer.transform(headlines), labels, classes=list(classes))
+        rows += len(labels)
+    return rows
@@ -0,0 +1,249 @@
+"""
+Score a file or a stream of headlines with a trained model.
+
+Headlines are read in batches from a txt (one headline per line), CSV, JSONL, Arrow or Parquet
+file, or from stdin, preprocessed with the model's preprocessor and scored at once. Each batch
+of labels and probabilities is written out before the next one is read, so a file of any size
+is scored in a bounded memory, and the throughput is logged to stderr.
+
+The model is an export of export.py, scored with NumPy only, or any model directory of
+train.py (models/<name> with a pipeline.joblib).
+
+    python predict.py datasets/new_headlines.csv --model models/sgd/export > predictions.csv
+    cat headlines.txt | python predict.py --format txt --model models/sgd/export --output-format jsonl
+"""
+import argparse
+import csv
+import io
+import json
+import logging
+import os
+import sys
+import time
+
+import numpy as np
+
+from export import LinearScorer
+from preprocessing import Preprocessor
+
+
+INPUT_FORMATS = ("txt", "csv", "jsonl", "arrow", "parquet")
+OUTPUT_FORMATS = ("csv", "jsonl")
+EXTENSIONS = {".txt": "txt", ".csv": "csv", ".jsonl": "jsonl", ".json": "jsonl", ".arrow": "arrow",
+              ".parquet": "parquet"}
+OUTPUT_FIELDS = ("Headline", "Label", "Probability")
+# Seconds between two throughput reports
+REPORT_INTERVAL = 10
+
+
+def guess_format(path, formats):
+    """
+    Return the format of a path from its extension, directories are Arrow corpora.
+    """
+    if os.path.isdir(path):
+        return "arrow"
+    format = EXTENSIONS.get(os.path.splitext(path)[1].lower())
+    if format not in formats:
+        raise ValueError(f"Cannot tell the format of {path}, pass it explicitly")
+    return format
+
+
+def find_column(names, column):
+    """
+    Return the name among `names` equal to `column` regardless of case, train.csv says "Headline"
+    where the Arrow corpus says "headline".
+    """
+    for name in names:
+        if name.lower() == column.lower():
+            return name
+    raise ValueError(f"No {column} column in {', '.join(names)}")
+
+
+def read_txt(file, batch_size, column):
+    batch = []
+    for line in file:
+        line = line.rstrip("\r\n")
+        if not line:
+            continue
+        batch.append(line)
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def read_csv(file, batch_size, column):
+    reader = csv.reader(file)
+    index = next(reader, None)
+    if index is None:
+        return
+    index = index.index(find_column(index, column))
+    batch = []
+    for row in reader:
+        batch.append(row[index] if index < len(row) else "")
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def read_jsonl(file, batch_size, column):
+    batch = []
+    name = None
+    for line in file:
+        if not line.strip():
+            continue
+        record = json.loads(line)
+        name = name or find_column(list(record), column)
+        batch.append(record.get(name) or "")
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def read_columnar(path, format, batch_size, column):
+    import pyarrow.parquet as pq
+
+    from crawler.corpus import get_parts
+
+    if format == "parquet":
+        parquet = pq.ParquetFile(path)
+        name = find_column(parquet.schema_arrow.names, column)
+        batches = parquet.iter_batches(batch_size, columns=[name])
+    else:
+        batches = iter_arrow_batches(get_parts(path) if os.path.isdir(path) else [path], batch_size, column)
+    for batch in batches:
+        yield [headline or "" for headline in batch.column(0).to_pylist()]
+
+
+def iter_arrow_batches(paths, batch_size, column):
+    import pyarrow as pa
+
+    for path in paths:
+        with pa.OSFile(path) as source:
+            reader = pa.ipc.open_file(source)
+            index = reader.schema.get_field_index(find_column(reader.schema.names, column))
+            for i in range(reader.num_record_batches):
+                batch = reader.get_batch(i).select([index])
+                for start in range(0, batch.num_rows, batch_size):
+                    yield batch.slice(start, batch_size)
+
+
+TEXT_READERS = {"txt": read_txt, "csv": read_csv, "jsonl": read_jsonl}
+
+
+def iter_headlines(source, format, batch_size=10000, column="Headline"):
+    """
+    Yield the batches of headlines of a file, or of stdin when `source` is "-".
+    """
+    if format not in TEXT_READERS:
+        if source == "-":
+            raise ValueError(f"{format} input must be a file, not stdin")
+        yield from read_columnar(source, format, batch_size, column)
+        return
+    if source == "-":
+        file = io.TextIOWrapper(sys.stdin.buffer, encoding="utf-8", newline="")
+        yield from TEXT_READERS[format](file, batch_size, column)
+        return
+    with open(source, "r", encoding="utf-8", newline="") as file:
+        yield from TEXT_READERS[format](file, batch_size, column)
+
+
+class Model:
+    """
+    A model directory with its preprocessor: an export of export.py, or a pipeline.joblib of train.py.
+    """
+
+    def __init__(self, directory):
+        self.preprocessor = Preprocessor.load(os.path.join(directory, "preprocessing.json"))
+        if os.path.exists(os.path.join(directory, "meta.json")):
+            self.scorer = LinearScorer.load(directory)
+        else:
+            import joblib
+
+            self.scorer = joblib.load(os.path.join(directory, "pipeline.joblib"))
+
+    def predict_proba(self, headlines):
+        """
+        Return the probability of the positive class (sarcasm) for a batch of raw headlines.
+        """
+        texts = self.preprocessor.transform(headlines)
+        if isinstance(self.scorer, LinearScorer) or not hasattr(self.scorer, "predict_proba"):
+            # Sigmoid of the margin for models without probabilities, such as SGD's hinge loss
+            return 1 / (1 + np.exp(-self.scorer.decision_function(texts)))
+        return self.scorer.predict_proba(texts)[:, 1]
+
+
+class PredictionWriter:
+    def __init__(self, file, format):
+        self.file = file
+        self.format = format
+        if format == "csv":
+            self.writer = csv.writer(file)
+            self.writer.writerow(OUTPUT_FIELDS)
+
+    def write(self, headlines, probabilities):
+        labels = (probabilities > 0.5).astype(int).tolist()
+        rows = zip(headlines, labels, np.round(probabilities, 6).tolist())
+        if self.format == "csv":
+            self.writer.writerows(rows)
+        else:
+            self.file.write("".join(json.dumps(dict(zip(OUTPUT_FIELDS, row)), ensure_ascii=False) + "\n"
+                                    for row in rows))
+        self.file.flush()
+
+
+def predict(model, batches, writer):
+    """
+    Score every batch and write it out, return the number of headlines scored.
+    """
+    rows = 0
+    start = last_report = time.perf_counter()
+    for headlines in batches:
+        writer.write(headlines, model.predict_proba(headlines))
+        rows += len(headlines)
+        now = time.perf_counter()
+        if now - last_report >= REPORT_INTERVAL:
+            logging.info(f"Scored {rows} headlines, {rows / (now - start):.0f} headlines/s.")
+            last_report = now
+    elapsed = time.perf_counter() - start
+    logging.info(f"Scored {rows} headlines in {elapsed:.1f}s, {rows / max(elapsed, 1e-9):.0f} headlines/s.")
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("input", nargs="?", default="-", help="file or Arrow corpus directory, stdin by default")
+    parser.add_argument("--model", default="models/sgd/export", help="export directory, or model directory of train.py")
+    parser.add_argument("--format", choices=INPUT_FORMATS, help="input format, guessed from the extension by default")
+    parser.add_argument("--column", default="Headline", help="headline column of CSV, JSONL and columnar inputs")
+    parser.add_argument("--output", default="-", help="output file, stdout by default")
+    parser.add_argument("--output-format", choices=OUTPUT_FORMATS, help="csv by default, or guessed from --output")
+    parser.add_argument("--batch-size", type=int, default=10000, help="headlines scored at once")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+    try:
+        format = args.format or ("txt" if args.input == "-" else guess_format(args.input, INPUT_FORMATS))
+        output_format = args.output_format or (
+            "csv" if args.output == "-" else guess_format(args.output, OUTPUT_FORMATS))
+    except ValueError as e:
+        parser.error(str(e))
+
+    model = Model(args.model)
+    batches = iter_headlines(args.input, format, args.batch_size, args.column)
+    if args.output == "-":
+        output = io.TextIOWrapper(sys.stdout.buffer, encoding="utf-8", newline="")
+        predict(model, batches, PredictionWriter(output, output_format))
+        output.detach()
+        return
+    with open(args.output, "w", encoding="utf-8", newline="") as file:
+        predict(model, batches, PredictionWriter(file, output_format))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,293 @@
+"""
+Headline preprocessing shared by training and inference.
+
+Same steps as experiment.ipynb: lowercase, drop every character but [0-9a-z ], tokenize,
+remove the NLTK and spaCy stop words and Porter-stem the remaining tokens.
+Cleaning is vectorized with pandas string methods, stop words are a frozenset and every
+distinct token is stemmed once.
+
+A fitted Preprocessor is saved next to the model and loaded at inference, so both sides use
+the same stop words and the stems of the training vocabulary.
+
+preprocess() runs a Preprocessor over a large corpus in a process pool and caches the result
+on disk, keyed by the corpus and the preprocessing settings.
+"""
+import hashlib
+import itertools
+import json
+import logging
+import os
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+from nltk.stem import PorterStemmer
+
+
+# Bump when the output of the same settings changes, cached corpora are recomputed
+VERSION = 1
+NON_ALPHANUMERIC = r"[^0-9a-z ]"
+# word_tokenize splits these even without apostrophes, which cleaning removed anyway
+TREEBANK_SPLITS = {
+    "cannot": ("can", "not"),
+    "gimme": ("gim", "me"),
+    "gonna": ("gon", "na"),
+    "gotta": ("got", "ta"),
+    "lemme": ("lem", "me"),
+    "wanna": ("wan", "na"),
+}
+
+
+def get_stop_word_sources():
+    """
+    Return the stop word lists available: NLTK's, and spaCy's when spaCy is installed.
+    """
+    try:
+        import spacy.lang.en.stop_words  # noqa: F401
+    except ImportError:
+        logging.warning("spaCy is not installed, only the NLTK stop words are removed: the output differs "
+                        "from a Preprocessor with spaCy's, install the spacy of requirements.txt.")
+        return ("nltk",)
+    return ("nltk", "spacy")
+
+
+def get_stop_words(sources=None):
+    """
+    Return the union of the English stop words of `sources`, every available list by default.
+    """
+    stop_words = set()
+    for source in get_stop_word_sources() if sources is None else sources:
+        if source == "nltk":
+            from nltk.corpus import stopwords
+
+            stop_words |= set(stopwords.words("english"))
+        elif source == "spacy":
+            from spacy.lang.en.stop_words import STOP_WORDS
+
+            stop_words |= STOP_WORDS
+        else:
+            raise ValueError(f"Unknown stop word source {source!r}, expected nltk or spacy")
+    return frozenset(stop_words)
+
+
+def clean(headlines):
+    """
+    Lowercase and keep only [0-9a-z ], for a whole Series (or list) of headlines at once.
+    """
+    headlines = pd.Series(headlines, dtype="string").fillna("")
+    return headlines.str.lower().str.replace(NON_ALPHANUMERIC, "", regex=True)
+
+
+def tokenize(text):
+    """
+    Tokenize a cleaned headline exactly as nltk.word_tokenize does.
+    """
+    tokens = []
+    for token in text.split():
+        if token in TREEBANK_SPLITS:
+            tokens.extend(TREEBANK_SPLITS[token])
+        else:
+            tokens.append(token)
+    return tokens
+
+
+class StemCache:
+    """
+    Token -> stem mapping, stemming becomes a dict lookup.
+
+    Until frozen every new token is added to `stems`, which ends up holding the training
+    vocabulary. Once frozen, tokens never seen in training go to a LRU of `max_unseen`
+    entries, so serving an endless stream of new words keeps a bounded memory.
+    """
+
+    def __init__(self, stems=None, max_unseen=100000, frozen=False):
+        self.stems = dict(stems or {})
+        self.unseen = OrderedDict()
+        self.max_unseen = max_unseen
+        self.frozen = frozen
+        self.stemmer = PorterStemmer()
+
+    def __len__(self):
+        return len(self.stems)
+
+    def get_stem(self, token):
+        stem = self.stems.get(token)
+        if stem is not None:
+            return stem
+        if not self.frozen:
+            stem = self.stems[token] = self.stemmer.stem(token)
+            return stem
+        stem = self.unseen.get(token)
+        if stem is not None:
+            self.unseen.move_to_end(token)
+            return stem
+        stem = self.unseen[token] = self.stemmer.stem(token)
+        if len(self.unseen) > self.max_unseen:
+            self.unseen.popitem(last=False)
+        return stem
+
+    def freeze(self):
+        self.frozen = True
+
+
+class Preprocessor:
+    """
+    Turn raw headlines into the space-joined stemmed tokens the vectorizers are fitted on.
+    """
+
+    def __init__(self, stop_words=None, stem=True, stems=None, stop_word_sources=None):
+        if stop_words is None:
+            stop_word_sources = stop_word_sources or get_stop_word_sources()
+            stop_words = get_stop_words(stop_word_sources)
+        self.stop_words = frozenset(stop_words)
+        # None for a custom list of stop words
+        self.stop_word_sources = list(stop_word_sources) if stop_word_sources is not None else None
+        self.stem = stem
+        self.stems = stems if stems is not None else StemCache()
+
+    @property
+    def config(self):
+        """
+        Settings that change the output, part of the keys of cached preprocessed corpora.
+        """
+        return {"stop_words": sorted(self.stop_words), "stop_word_sources": self.stop_word_sources,
+                "stem": self.stem}
+
+    def get_tokens(self, text):
+        """
+        Return the stemmed tokens of a cleaned headline, stop words removed.
+        """
+        stop_words = self.stop_words
+        tokens = [token for token in tokenize(text) if token not in stop_words]
+        if self.stem:
+            stems = self.stems.stems
+            tokens = [stems[token] if token in stems else self.stems.get_stem(token) for token in tokens]
+        return tokens
+
+    def transform(self, headlines):
+        """
+        Return the list of preprocessed headlines, each one a string of space-separated tokens.
+        """
+        return [" ".join(self.get_tokens(text)) for text in clean(headlines)]
+
+    __call__ = transform
+
+    def fit_transform(self, headlines):
+        """
+        Transform the training headlines and freeze the stem cache on their vocabulary.
+        """
+        result = self.transform(headlines)
+        self.stems.freeze()
+        return result
+
+    def save(self, path):
+        """
+        Save the stop words and the stems of the training vocabulary, next to the model.
+        """
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        state = dict(self.config, stems=self.stems.stems, max_unseen=self.stems.max_unseen)
+        with open(path, "w", encoding="utf-8") as file:
+            json.dump(state, file, ensure_ascii=False)
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "r", encoding="utf-8") as file:
+            state = json.load(file)
+        stems = StemCache(state["stems"], state["max_unseen"], frozen=True)
+        return cls(state["stop_words"], state["stem"], stems, state.get("stop_word_sources"))
+
+
+# Preprocessor of a worker process, with the number of stems it already sent back
+worker_state = {}
+
+
+def init_worker(preprocessor):
+    worker_state["preprocessor"] = preprocessor
+    worker_state["sent"] = len(preprocessor.stems.stems)
+
+
+def transform_chunk(headlines):
+    """
+    Transform a chunk in a worker, returns the rows and the stems learned since the last chunk.
+    """
+    preprocessor = worker_state["preprocessor"]
+    rows = preprocessor.transform(headlines)
+    stems = preprocessor.stems.stems
+    learned = dict(itertools.islice(stems.items(), worker_state["sent"], None))
+    worker_state["sent"] = len(stems)
+    return rows, learned
+
+
+def get_cache_key(headlines, preprocessor):
+    """
+    Hash of the headlines and of the preprocessing settings.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(json.dumps(dict(preprocessor.config, version=VERSION), sort_keys=True).encode("utf-8"))
+    for headline in headlines:
+        digest.update(headline.encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def iter_chunks(headlines, preprocessor, workers=None, chunk_size=20000):
+    """
+    Yield the preprocessed chunks of `headlines` in order, computed by `workers` processes.
+    """
+    chunks = (headlines[start:start + chunk_size] for start in range(0, len(headlines), chunk_size))
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(headlines) <= chunk_size:
+        for chunk in chunks:
+            yield preprocessor.transform(chunk)
+        return
+    frozen = preprocessor.stems.frozen
+    with ProcessPoolExecutor(workers, initializer=init_worker, initargs=(preprocessor,)) as pool:
+        # map() returns the results in the order of the chunks while the pool runs ahead
+        for rows, learned in pool.map(transform_chunk, chunks):
+            if not frozen:
+                preprocessor.stems.stems.update(learned)
+            yield rows
+
+
+def preprocess(headlines, preprocessor, workers=None, chunk_size=20000, cache_dir=None, fit=False):
+    """
+    Preprocess a corpus in parallel and return the list of its preprocessed headlines.
+
+    With `cache_dir`, the result and the stems learned are stored under a key of the corpus and
+    the settings, preprocessing an unchanged corpus again only reads them back. With `fit`, the
+    stem cache is frozen afterwards, like Preprocessor.fit_transform.
+    """
+    headlines = ["" if headline is None else str(headline) for headline in headlines]
+    path = None
+    if cache_dir is not None:
+        key = get_cache_key(headlines, preprocessor)
+        path = os.path.join(cache_dir, f"{key}.txt")
+        stems_path = os.path.join(cache_dir, f"{key}.stems.json")
+        if os.path.exists(path) and os.path.exists(stems_path):
+            logging.info(f"Preprocessed corpus found in {path}.")
+            if not preprocessor.stems.frozen:
+                with open(stems_path, "r", encoding="utf-8") as file:
+                    preprocessor.stems.stems.update(json.load(file))
+            if fit:
+                preprocessor.stems.freeze()
+            with open(path, "r", encoding="utf-8") as file:
+                return file.read().split("\n")[:-1]
+
+    rows = []
+    for chunk in iter_chunks(headlines, preprocessor, workers, chunk_size):
+        rows.extend(chunk)
+    if fit:
+        preprocessor.stems.freeze()
+
+    if path is not None:
+        os.makedirs(cache_dir, exist_ok=True)
+        # Rows never contain a newline, cleaning only keeps [0-9a-z ]
+        with open(path + ".tmp", "w", encoding="utf-8") as file:
+            file.write("".join(row + "\n" for row in rows))
+        with open(stems_path + ".tmp", "w", encoding="utf-8") as file:
+            json.dump(preprocessor.stems.stems, file)
+        os.replace(stems_path + ".tmp", stems_path)
+        os.replace(path + ".tmp", path)
+    return rows
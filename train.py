@@ -0,0 +1,495 @@
+"""
+Train and compare the classifiers of experiment.ipynb on datasets/train.csv and test.csv.
+
+Headlines are preprocessed and turned into a TF-IDF matrix once, then every classifier is fitted
+on the same matrix instead of re-vectorizing the corpus in its own pipeline. The matrices are
+cached as CSR arrays (data, indices, indptr) under datasets/build/features/<key>, where the key
+hashes the preprocessed corpus and the vectorizer settings, and are memory-mapped when the
+corpus is trained on again. Each fitted model is saved under models/<name> with its preprocessor.
+
+Models are fitted concurrently in a process pool, each worker memory-maps the cached features.
+The pool never uses more than --cpus cores: every model runs single-threaded (BLAS and OpenMP
+pools included, through threadpoolctl) except XGBoost, which gets the cores the others leave.
+A full comparison takes about as long as its slowest model.
+
+    python train.py --models nb sgd --cpus 4
+
+With --stream, nb and sgd are trained out of core instead: the training set is read from disk in
+mini-batches of hashed features (see features.py) fed to partial_fit, with periodic checkpoints
+under models/stream. Running it again resumes from the last checkpoint, so new rows appended to
+the training set, or a new file of crawled headlines, are folded into the models without a retrain.
+A training set built again by dataset.py is not an append and needs --restart.
+
+    python train.py --stream --train datasets/train.csv --batch-size 20000
+"""
+import argparse
+import hashlib
+import json
+import logging
+import os
+import shutil
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import joblib
+import numpy as np
+import pandas as pd
+import scipy.sparse as sp
+from sklearn.feature_extraction.text import CountVectorizer, TfidfTransformer
+from sklearn.metrics import accuracy_score, f1_score, precision_score, recall_score
+from sklearn.pipeline import Pipeline
+from tabulate import tabulate
+from threadpoolctl import threadpool_limits
+
+from features import CLASSES, HashingFeaturizer, get_batch, iter_csv_batches, iter_csv_chunks
+from preprocessing import Preprocessor, preprocess
+
+
+# Bump when the layout of cached features changes, every corpus is vectorized again
+VERSION = 1
+VECTORIZER = {"count": {}, "tfidf": {}}
+CSR_ARRAYS = ("data", "indices", "indptr")
+
+
+def get_nb(threads=1):
+    from sklearn.naive_bayes import MultinomialNB
+
+    return MultinomialNB()
+
+
+def get_sgd(threads=1):
+    from sklearn.linear_model import SGDClassifier
+
+    return SGDClassifier()
+
+
+def get_gbc(threads=1):
+    from sklearn.ensemble import GradientBoostingClassifier
+
+    return GradientBoostingClassifier(n_estimators=100, max_depth=10)
+
+
+def get_dt(threads=1):
+    from sklearn.tree import DecisionTreeClassifier
+
+    return DecisionTreeClassifier(criterion="gini", splitter="best", max_depth=50, min_samples_split=2,
+                                  min_samples_leaf=1)
+
+
+def get_xgb(threads=1):
+    import xgboost as xgb
+
+    return xgb.XGBClassifier(max_depth=15, learning_rate=0.1, n_estimators=100, verbosity=0,
+                             objective="binary:logistic", booster="gbtree", n_jobs=threads)
+
+
+# name: (title in the comparison table, classifier factory)
+MODELS = {
+    "nb": ("Multinomial Naive Bayes", get_nb),
+    "sgd": ("SGD Classifier", get_sgd),
+    "gbc": ("Gradient Boosting Classifier", get_gbc),
+    "dt": ("Decision Tree", get_dt),
+    "xgb": ("XGBoost Classifier", get_xgb),
+}
+# Models that use several threads when given them
+THREADED = {"xgb"}
+# Slowest first, so that the longest fits start right away
+SCHEDULE = ("gbc", "xgb", "dt", "sgd", "nb")
+# Models supporting partial_fit, trained by --stream
+STREAMING = ("nb", "sgd")
+
+
+def save_csr(directory, name, matrix):
+    for array in CSR_ARRAYS:
+        np.save(os.path.join(directory, f"{name}.{array}.npy"), getattr(matrix, array))
+
+
+def load_csr(directory, name, shape):
+    """
+    Memory-map a CSR matrix saved by save_csr, its arrays are only read from disk when used.
+    """
+    arrays = [np.load(os.path.join(directory, f"{name}.{array}.npy"), mmap_mode="r") for array in CSR_ARRAYS]
+    return sp.csr_matrix(tuple(arrays), shape=shape, copy=False)
+
+
+class Features:
+    """
+    TF-IDF matrices of the train and test sets, with the vocabulary and IDF they were built with.
+    """
+
+    def __init__(self, x_train, x_test, vocabulary, idf, config=VECTORIZER, directory=None):
+        self.x_train = x_train
+        self.x_test = x_test
+        self.vocabulary = vocabulary
+        self.idf = idf
+        self.config = config
+        # Cache directory the matrices are memory-mapped from, if any
+        self.directory = directory
+
+    @classmethod
+    def fit(cls, train_rows, test_rows, config=VECTORIZER):
+        count = CountVectorizer(**config["count"])
+        tfidf = TfidfTransformer(**config["tfidf"])
+        x_train = tfidf.fit_transform(count.fit_transform(train_rows)).tocsr()
+        x_test = tfidf.transform(count.transform(test_rows)).tocsr()
+        return cls(x_train, x_test, count.get_feature_names_out().tolist(), tfidf.idf_, config)
+
+    def get_vectorizers(self):
+        """
+        Return the fitted CountVectorizer and TfidfTransformer, to put in front of a classifier.
+        """
+        count = CountVectorizer(**self.config["count"])
+        count.vocabulary_ = {term: index for index, term in enumerate(self.vocabulary)}
+        count.fixed_vocabulary_ = True
+        tfidf = TfidfTransformer(**self.config["tfidf"])
+        tfidf.idf_ = np.asarray(self.idf)
+        return count, tfidf
+
+    def save(self, directory):
+        """
+        Save the matrices and the vectorizer state, written to a temporary directory first.
+        """
+        temporary = directory + ".tmp"
+        shutil.rmtree(temporary, ignore_errors=True)
+        os.makedirs(temporary)
+        save_csr(temporary, "train", self.x_train)
+        save_csr(temporary, "test", self.x_test)
+        np.save(os.path.join(temporary, "idf.npy"), self.idf)
+        # Terms match \w\w+, never a newline
+        with open(os.path.join(temporary, "vocabulary.txt"), "w", encoding="utf-8") as file:
+            file.write("".join(term + "\n" for term in self.vocabulary))
+        meta = {"config": self.config, "train": self.x_train.shape, "test": self.x_test.shape}
+        with open(os.path.join(temporary, "meta.json"), "w", encoding="utf-8") as file:
+            json.dump(meta, file)
+        shutil.rmtree(directory, ignore_errors=True)
+        os.replace(temporary, directory)
+
+    @classmethod
+    def load(cls, directory):
+        with open(os.path.join(directory, "meta.json"), "r", encoding="utf-8") as file:
+            meta = json.load(file)
+        with open(os.path.join(directory, "vocabulary.txt"), "r", encoding="utf-8") as file:
+            vocabulary = file.read().split("\n")[:-1]
+        idf = np.load(os.path.join(directory, "idf.npy"), mmap_mode="r")
+        x_train = load_csr(directory, "train", tuple(meta["train"]))
+        x_test = load_csr(directory, "test", tuple(meta["test"]))
+        return cls(x_train, x_test, vocabulary, idf, meta["config"], directory)
+
+
+def get_features_key(train_rows, test_rows, config=VECTORIZER):
+    """
+    Hash of the preprocessed train and test sets and of the vectorizer settings.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(json.dumps(dict(config, version=VERSION), sort_keys=True).encode("utf-8"))
+    for rows in (train_rows, test_rows):
+        for row in rows:
+            digest.update(row.encode("utf-8"))
+            digest.update(b"\n")
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def get_features(train_rows, test_rows, cache_dir="datasets/build/features", config=VECTORIZER):
+    """
+    Return the Features of a preprocessed corpus, from the cache when it was vectorized before.
+    """
+    directory = os.path.join(cache_dir, get_features_key(train_rows, test_rows, config))
+    if os.path.exists(os.path.join(directory, "meta.json")):
+        logging.info(f"Features found in {directory}.")
+        return Features.load(directory)
+    start = time.perf_counter()
+    features = Features.fit(train_rows, test_rows, config)
+    logging.info(f"Vectorized {features.x_train.shape[0]} train and {features.x_test.shape[0]} test rows "
+                 f"into {features.x_train.shape[1]} features in {time.perf_counter() - start:.1f}s.")
+    features.save(directory)
+    # The memory-mapped copy lets the freshly built matrices be freed
+    return Features.load(directory)
+
+
+def get_scores(y_true, y_pred):
+    return [accuracy_score(y_true, y_pred), f1_score(y_true, y_pred), precision_score(y_true, y_pred),
+            recall_score(y_true, y_pred)]
+
+
+def train_model(name, features, y_train, y_test, threads=1):
+    """
+    Fit a classifier on the cached features, return it with its fit time and test scores.
+    """
+    classifier = MODELS[name][1](threads)
+    start = time.perf_counter()
+    classifier.fit(features.x_train, y_train)
+    elapsed = time.perf_counter() - start
+    scores = get_scores(y_test, classifier.predict(features.x_test))
+    return classifier, elapsed, scores
+
+
+def fit_model(name, features_dir, y_train, y_test, threads=1):
+    """
+    Process pool task: train a model on the memory-mapped features with at most `threads` threads.
+    """
+    with threadpool_limits(limits=threads):
+        return train_model(name, Features.load(features_dir), y_train, y_test, threads)
+
+
+def train_models(names, features, y_train, y_test, cpus=None):
+    """
+    Train the models concurrently within a budget of `cpus` cores, yield (name, result) as they end.
+
+    A result is the (classifier, fit time, scores) of train_model, or the ImportError of a model
+    whose library is not installed.
+    """
+    cpus = cpus or os.cpu_count() or 1
+    names = sorted(names, key=SCHEDULE.index)
+    workers = min(len(names), cpus)
+    # Threaded models take the cores the single-threaded ones running next to them leave
+    spare = cpus - workers + 1
+    with ProcessPoolExecutor(workers) as pool:
+        futures = {
+            pool.submit(fit_model, name, features.directory, y_train, y_test, spare if name in THREADED else 1): name
+            for name in names
+        }
+        for future in as_completed(futures):
+            try:
+                yield futures[future], future.result()
+            except ImportError as e:
+                yield futures[future], e
+
+
+def save_model(directory, features, classifier, preprocessor):
+    """
+    Save the fitted pipeline of a model, which predicts preprocessed headlines, and its preprocessor.
+    """
+    os.makedirs(directory, exist_ok=True)
+    count, tfidf = features.get_vectorizers()
+    pipeline = Pipeline([("vect", count), ("tfidf", tfidf), ("clf", classifier)])
+    joblib.dump(pipeline, os.path.join(directory, "pipeline.joblib"))
+    preprocessor.save(os.path.join(directory, "preprocessing.json"))
+
+
+def update_digest(digest, file, size=None, block_size=1 << 20):
+    """
+    Feed the next `size` bytes of a file to a hash, or the rest of the file.
+    """
+    while size is None or size > 0:
+        block = file.read(block_size if size is None else min(block_size, size))
+        if not block:
+            break
+        digest.update(block)
+        if size is not None:
+            size -= len(block)
+
+
+class StreamingTrainer:
+    """
+    Train partial_fit models on CSV files read in mini-batches, with periodic checkpoints.
+
+    A checkpoint holds the models, the featurizer settings and the number of rows read from every
+    file with its size and hash. Training a file again only reads the rows appended since, a file
+    rewritten in between, such as a train.csv built again by dataset.py, is refused: its rows no
+    longer line up with the rows trained on. Training a new file folds it into the models. Each
+    checkpoint also saves the models under models/<name>-stream, in the layout of save_model.
+
+    The stem cache is frozen after the first file, like Preprocessor.fit_transform.
+    """
+
+    def __init__(self, names=STREAMING, model_dir="models", batch_size=20000, checkpoint_every=10,
+                 featurizer=None, preprocessor=None):
+        self.names = list(names)
+        self.model_dir = model_dir
+        self.batch_size = batch_size
+        self.checkpoint_every = checkpoint_every
+        self.featurizer = featurizer or HashingFeaturizer()
+        self.preprocessor = preprocessor or Preprocessor()
+        self.classifiers = {name: MODELS[name][1]() for name in self.names}
+        # Absolute path of every file trained on: rows read, with the size, mtime and hash of the file
+        self.sources = {}
+        self.rows = 0
+        # Seconds spent in partial_fit by every model in this run
+        self.fit_times = dict.fromkeys(self.names, 0.0)
+
+    @property
+    def directory(self):
+        return os.path.join(self.model_dir, "stream")
+
+    def save(self):
+        """
+        Write a checkpoint, atomically, and the pipelines of the models.
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        self.preprocessor.save(os.path.join(self.directory, "preprocessing.json"))
+        state = {
+            "classifiers": self.classifiers,
+            "featurizer": self.featurizer.config,
+            "sources": self.sources,
+            "rows": self.rows,
+        }
+        path = os.path.join(self.directory, "checkpoint.joblib")
+        joblib.dump(state, path + ".tmp")
+        os.replace(path + ".tmp", path)
+        for name, classifier in self.classifiers.items():
+            directory = os.path.join(self.model_dir, f"{name}-stream")
+            os.makedirs(directory, exist_ok=True)
+            pipeline = Pipeline([("vect", self.featurizer.vectorizer), ("clf", classifier)])
+            joblib.dump(pipeline, os.path.join(directory, "pipeline.joblib"))
+            self.preprocessor.save(os.path.join(directory, "preprocessing.json"))
+
+    def load(self):
+        """
+        Resume from the last checkpoint, return whether there was one.
+        """
+        path = os.path.join(self.directory, "checkpoint.joblib")
+        if not os.path.exists(path):
+            return False
+        state = joblib.load(path)
+        if sorted(state["classifiers"]) != sorted(self.names):
+            raise ValueError(f"The checkpoint in {self.directory} trains {', '.join(state['classifiers'])}, "
+                             f"not {', '.join(self.names)}.")
+        self.classifiers = state["classifiers"]
+        self.featurizer = HashingFeaturizer(**state["featurizer"])
+        self.preprocessor = Preprocessor.load(os.path.join(self.directory, "preprocessing.json"))
+        self.sources = state["sources"]
+        self.rows = state["rows"]
+        logging.info(f"Resuming from {path}, {self.rows} rows trained on.")
+        return True
+
+    def get_fingerprint(self, path):
+        """
+        Return the size, mtime and hash of a file, checked against the fingerprint it was trained on.
+
+        The file may only have grown since: its first bytes must hash the same as the whole file did.
+        """
+        trained = self.sources.get(os.path.abspath(path))
+        stat = os.stat(path)
+        if trained is not None and (stat.st_size, stat.st_mtime) == (trained["size"], trained["mtime"]):
+            return {key: trained[key] for key in ("size", "mtime", "hash")}
+        digest = hashlib.blake2b(digest_size=16)
+        with open(path, "rb") as file:
+            if trained is not None:
+                update_digest(digest, file, trained["size"])
+                if digest.hexdigest() != trained["hash"]:
+                    raise ValueError(f"{path} was rewritten since {trained['rows']} of its rows were trained on, "
+                                     f"pass --restart to train from scratch.")
+            update_digest(digest, file)
+        return {"size": stat.st_size, "mtime": stat.st_mtime, "hash": digest.hexdigest()}
+
+    def fit(self, path):
+        """
+        Train on the rows of a CSV file not read yet, return their number.
+        """
+        source = os.path.abspath(path)
+        fingerprint = self.get_fingerprint(path)
+        skip = self.sources[source]["rows"] if source in self.sources else 0
+        if skip:
+            logging.info(f"Skipping the {skip} rows of {path} already trained on.")
+        rows = 0
+        start = time.perf_counter()
+        for batch, chunk in enumerate(iter_csv_chunks(path, self.batch_size, skip), 1):
+            headlines, labels = get_batch(chunk)
+            if len(labels):
+                x = self.featurizer.transform(self.preprocessor.transform(headlines))
+                for name, classifier in self.classifiers.items():
+                    fit_start = time.perf_counter()
+                    classifier.partial_fit(x, labels, classes=list(CLASSES))
+                    self.fit_times[name] += time.perf_counter() - fit_start
+            rows += len(chunk)
+            self.sources[source] = dict(fingerprint, rows=skip + rows)
+            self.rows += len(labels)
+            if batch % self.checkpoint_every == 0:
+                self.save()
+                logging.info(f"Checkpoint after {skip + rows} rows of {path}, "
+                             f"{rows / (time.perf_counter() - start):.0f} rows/s.")
+        self.preprocessor.stems.freeze()
+        if rows:
+            self.save()
+        logging.info(f"Trained on {rows} new rows of {path}.")
+        return rows
+
+    def evaluate(self, path):
+        """
+        Return the test scores of every model on a CSV file, read in mini-batches.
+        """
+        predictions = {name: [] for name in self.classifiers}
+        y_true = []
+        for headlines, labels in iter_csv_batches(path, self.batch_size):
+            x = self.featurizer.transform(self.preprocessor.transform(headlines))
+            for name, classifier in self.classifiers.items():
+                predictions[name].append(classifier.predict(x))
+            y_true.append(labels)
+        y_true = np.concatenate(y_true)
+        return {name: get_scores(y_true, np.concatenate(y_pred)) for name, y_pred in predictions.items()}
+
+
+def read_split(path):
+    frame = pd.read_csv(path, usecols=["Headline", "Label"]).dropna()
+    return frame["Headline"].astype(str).tolist(), frame["Label"].astype(int).to_numpy()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--train", default="datasets/train.csv")
+    parser.add_argument("--test", default="datasets/test.csv")
+    parser.add_argument("--models", nargs="+", choices=MODELS, help="every model by default, nb and sgd with --stream")
+    parser.add_argument("--model-dir", default="models", help="directory of the saved models")
+    parser.add_argument("--cache-dir", default="datasets/build", help="directory of the preprocessing and feature caches")
+    parser.add_argument("--cpus", type=int, help="cores used to preprocess and train, every core by default")
+    parser.add_argument("--stream", action="store_true", help="train out of core with partial_fit, resuming from the last checkpoint")
+    parser.add_argument("--batch-size", type=int, default=20000, help="rows per mini-batch with --stream")
+    parser.add_argument("--checkpoint-every", type=int, default=10, help="mini-batches between checkpoints with --stream")
+    parser.add_argument("--restart", action="store_true", help="ignore the checkpoint of --stream and train from scratch")
+    args = parser.parse_args()
+
+    if args.stream and set(args.models or ()) - set(STREAMING):
+        parser.error(f"--stream only trains {', '.join(STREAMING)}")
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+    if args.stream:
+        stream(args, parser)
+    else:
+        compare(args)
+
+
+def stream(args, parser):
+    trainer = StreamingTrainer(args.models or STREAMING, args.model_dir, args.batch_size, args.checkpoint_every)
+    try:
+        if not args.restart:
+            trainer.load()
+        # A checkpoint of other models or of a rewritten training file is refused before training
+        trainer.get_fingerprint(args.train)
+    except ValueError as e:
+        parser.error(str(e))
+    trainer.fit(args.train)
+    scores = trainer.evaluate(args.test)
+    all_result = [[" ", "Accuracy", "F1 Score", "Precision", "Recall", "Training time"]]
+    all_result.extend([MODELS[name][0], *scores[name], trainer.fit_times[name]] for name in trainer.names)
+    print(tabulate(all_result, headers="firstrow"))
+
+
+def compare(args):
+    train_headlines, y_train = read_split(args.train)
+    test_headlines, y_test = read_split(args.test)
+
+    preprocessor = Preprocessor()
+    preprocessed_dir = os.path.join(args.cache_dir, "preprocessed")
+    train_rows = preprocess(train_headlines, preprocessor, args.cpus, cache_dir=preprocessed_dir, fit=True)
+    test_rows = preprocess(test_headlines, preprocessor, args.cpus, cache_dir=preprocessed_dir)
+    features = get_features(train_rows, test_rows, os.path.join(args.cache_dir, "features"))
+
+    start = time.perf_counter()
+    results = {}
+    for name, result in train_models(args.models or list(MODELS), features, y_train, y_test, args.cpus):
+        if isinstance(result, ImportError):
+            logging.error(f"Skipping {name}: {result}")
+            continue
+        classifier, elapsed, scores = result
+        logging.info(f"Trained {name} in {elapsed:.1f}s.")
+        save_model(os.path.join(args.model_dir, name), features, classifier, preprocessor)
+        results[name] = [MODELS[name][0], *scores, elapsed]
+    logging.info(f"Trained {len(results)} models in {time.perf_counter() - start:.1f}s.")
+
+    all_result = [[" ", "Accuracy", "F1 Score", "Precision", "Recall", "Training time"]]
+    all_result.extend(results[name] for name in MODELS if name in results)
+    print(tabulate(all_result, headers="firstrow"))
+
+
+if __name__ == "__main__":
+    main()